@@ -0,0 +1,272 @@
+import time
+from collections import OrderedDict
+from PIL import Image, ImageTk
+
+from perf_monitor import monitor
+
+
+class GifAnimation:
+    """
+    Streaming frame source of an animated image. Frames are decoded on demand and only the last few PhotoImages are
+    kept (ring buffer), so start-up time and memory do not grow with the length of the animation.
+
+    Args:
+        image (PIL.Image): The opened, animated image. Kept open to seek frames.
+        cache_size (int, optional): Decoded frames kept in memory.
+    """
+
+    def __init__(self, image:Image.Image, cache_size:int = 4):
+        self.image = image
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.index = 0
+
+    def frame(self, index:int):
+        """
+        Returns a frame as a PhotoImage. Must be called from the Tk thread.
+
+        Args:
+            index (int): The frame number.
+
+        Raises:
+            EOFError: if the animation has no such frame.
+
+        Returns:
+            ImageTk.PhotoImage: The frame.
+        """
+        if index in self.cache:
+            self.cache.move_to_end(index)
+            return self.cache[index]
+
+        self.image.seek(index)
+        photo = ImageTk.PhotoImage(self.image.copy())
+
+        self.cache[index] = photo
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last = False)
+
+        return photo
+
+    def next_frame(self):
+        """
+        Returns the next frame, wrapping to the first one after the last. The frame count is never computed up front.
+
+        Returns:
+            ImageTk.PhotoImage: The frame.
+        """
+        try:
+            photo = self.frame(self.index)
+        except EOFError:
+            self.index = 0
+            photo = self.frame(0)
+
+        self.index += 1
+        return photo
+
+
+class AnimationClock:
+    """
+    Single clock owning every running animation of the application (GIFs, rolling text). One `after` tick advances
+    the animations that are due, within a per-tick time budget, and the next tick is scheduled for the earliest due
+    frame, so the clock only wakes when there is a frame to draw. Late animations skip their missed frames instead of
+    catching up, hidden or covered ones are paused, destroyed ones are unregistered. The clock stops ticking when
+    nothing is registered.
+
+    Args:
+        root (tk.Tk): The application window.
+        tick (int, optional): Shortest delay between two ticks, in milliseconds.
+        budget (float, optional): Seconds of animation work allowed per tick, the rest waits for the next tick.
+        recheck (float, optional): Seconds a visibility check stays valid. Paused animations are checked at that pace.
+    """
+
+    def __init__(self, root, tick:int = 10, budget:float = 0.008, recheck:float = 0.25):
+        self.root = root
+        self.tick_ms = tick
+        self.budget = budget
+        self.recheck = recheck
+        self.animations = {} # widget path -> entry
+        self.cursor = 0
+        self.job = None
+
+    def register(self, widget, step:callable, interval:int):
+        """
+        Registers an animation. Replaces any animation already registered on the widget.
+
+        Args:
+            widget (tk.Widget): The animated widget. Unregistered once destroyed.
+            step (callable): Advances the animation by one frame. Returns False once the animation is over.
+            interval (int): Milliseconds between frames.
+        """
+        key = str(widget)
+        self.animations[key] = {"widget": widget, "step": step, "interval": interval / 1000, "due": time.perf_counter(),
+                                "checked": None, "visible": False}
+
+        widget.bind("<Destroy>", lambda event: self.unregister(widget) if event.widget is widget else None, add = "+")
+        self.schedule()
+
+    def unregister(self, widget):
+        self.animations.pop(str(widget), None)
+
+    def schedule(self):
+        """
+        Schedules the next tick for the earliest due frame, replacing a later one. Stops the clock when nothing is
+        registered.
+        """
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+
+        if self.animations:
+            delay = min(entry["due"] for entry in self.animations.values()) - time.perf_counter()
+            self.job = self.root.after(max(self.tick_ms, int(delay * 1000)), self.tick)
+
+    def visible(self, widget):
+        """
+        Args:
+            widget (tk.Widget): An animated widget.
+
+        Returns:
+            bool: False if the widget is unmapped, or covered at its center by another widget.
+        """
+        if not widget.winfo_viewable():
+            return False
+
+        center = widget.winfo_containing(widget.winfo_rootx() + widget.winfo_width() // 2,
+                                         widget.winfo_rooty() + widget.winfo_height() // 2)
+        return center is None or center is widget
+
+    def tick(self):
+        """
+        Advances every due animation, starting from a rotating position so that a tight budget is shared fairly.
+        """
+        # variables.
+        self.job = None
+        begin = time.perf_counter()
+        keys = list(self.animations)
+        self.cursor = (self.cursor + 1) % max(len(keys), 1)
+
+        for key in keys[self.cursor:] + keys[:self.cursor]:
+            now = time.perf_counter()
+            if now - begin > self.budget:
+                break
+
+            entry = self.animations.get(key)
+            if entry is None or now < entry["due"]:
+                continue
+
+            # Frames missed while the event loop was busy are dropped, not replayed.
+            entry["due"] += entry["interval"]
+            if entry["due"] < now:
+                entry["due"] = now + entry["interval"]
+
+            if not entry["widget"].winfo_exists():
+                self.unregister(entry["widget"])
+                continue
+
+            # Visibility costs several round-trips to Tk, it is checked again only once the last check is stale.
+            if entry["checked"] is None or now - entry["checked"] > self.recheck:
+                entry["visible"], entry["checked"] = self.visible(entry["widget"]), now
+
+            if not entry["visible"]:
+                entry["due"] = max(entry["due"], entry["checked"] + self.recheck) # paused until the next check.
+            elif entry["step"]() is False:
+                self.unregister(entry["widget"])
+
+        self.schedule()
+
+
+class Typewriter:
+    """
+    Non-blocking typewriter renderer. Text is inserted from `after` callbacks, a few units (characters or words) per
+    tick, so the event loop keeps running while a long text is typed. Long texts get bigger chunks, so that they still
+    finish within a few seconds. The time budget only caps a tick.
+
+    Args:
+        widget (tk.Text): The target widget, may be reused by a later Typewriter. Typing stops if it is destroyed.
+        units (list): The pieces of text inserted one by one.
+        per_tick (int, optional): Units typed per tick, for texts short enough to be typed within duration.
+        delay (int, optional): Milliseconds between ticks.
+        budget (float, optional): Seconds of typing allowed per tick, at least one unit is typed.
+        duration (float, optional): Seconds a long text may take, its chunk grows with its length to fit.
+    """
+
+    def __init__(self, widget, units:list, per_tick:int = 2, delay:int = 15, budget:float = 0.004, duration:float = 3.0):
+        self.widget = widget
+        self.units = units
+        self.per_tick = max(per_tick, -(-len(units) * delay // int(duration * 1000))) # ceil of units per tick.
+        self.delay = delay
+        self.budget = budget
+
+        self.position = 0
+        self.job = None
+        self.finished = False
+        self.cancelled = False
+        self.callbacks = []
+
+    def start(self, instant:bool = False):
+        """
+        Starts typing. Returns right away.
+
+        Args:
+            instant (bool, optional): Inserts the whole text at once.
+        """
+        if instant:
+            self.widget.insert("end", "".join(self.units))
+            self.position = len(self.units)
+            self.finish()
+        else:
+            self.job = self.widget.after(self.delay, self.step)
+
+    def step(self):
+        if not self.widget.winfo_exists(): # destroyed meanwhile, nothing to type into.
+            self.job = None
+            return self.cancel()
+
+        begin = time.perf_counter()
+        stop = min(self.position + self.per_tick, len(self.units))
+
+        while self.position < stop:
+            self.widget.insert("end", self.units[self.position])
+            self.position += 1
+            if time.perf_counter() - begin > self.budget: # the rest of the chunk waits for the next tick.
+                break
+
+        if monitor.enabled: # typing steps are too many to log, only the overlay counts them.
+            monitor.record("typewriter_step", time.perf_counter() - begin, log = False)
+
+        if self.position < len(self.units):
+            self.job = self.widget.after(self.delay, self.step)
+        else:
+            self.job = None
+            self.finish()
+
+    def finish(self):
+        self.finished = True
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def cancel(self):
+        """
+        Stops typing. Pending on_done callbacks are dropped.
+        """
+        if self.job is not None:
+            try:
+                self.widget.after_cancel(self.job)
+            except Exception: # the widget is already being destroyed.
+                pass
+            self.job = None
+        self.cancelled = True
+        self.callbacks = []
+
+    def on_done(self, callback:callable):
+        """
+        Runs a callback once the whole text is typed (right away if it already is). Never runs if typing is cancelled.
+
+        Args:
+            callback (callable): Called without arguments.
+        """
+        if self.finished:
+            callback()
+        elif not self.cancelled:
+            self.callbacks.append(callback)
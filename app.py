@@ -1,24 +1,31 @@
-import pandas as pd
-import tkinter as tk
+from startup_profile import profile
+
+with profile.span("import tkinter/PIL"):
+    import tkinter as tk
+    from tkinter import ttk
+    from PIL import Image, ImageTk, UnidentifiedImageError
+with profile.span("import pandas/yaml"):
+    import pandas as pd
+    import yaml
 import os
 import re
-import yaml
-import requests
-import numpy as np
-import threading
+import random
+import sys
 import time
-import queue
-import csv
-from tkinter import ttk
-from PIL import Image, ImageTk, ImageSequence, UnidentifiedImageError
-from tk_config import style
-from fuzzywuzzy import process
-from jikanpy import Jikan
-from messages import messages, authors, casey_computer_sequence, casey_computer_name, fugitive, rolling_type_message
+with profile.span("import app modules"):
+    from tk_config import style
+    from animation import GifAnimation, AnimationClock, Typewriter
+    from query_engine import QueryEngine, load_anime_info, load_recomendations
+    from results_view import ResultsPane
+    from favorites import FavoritesStore
+    from perf_monitor import monitor, PerfOverlay
+    from messages import messages, authors, casey_computer_sequence, casey_computer_name, fugitive, rolling_type_message
+
+# NOTE: fuzzy_search, jikanpy and requests are imported on first use (a search miss, an API call).
 
 
 class AnimeApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, startup_profile:bool = False, perf:bool = False):
         super().__init__()
 
         self.title("myAnimeTerminal")
@@ -26,33 +33,159 @@ class AnimeApp(tk.Tk):
         self.resizable(False, False)
         self.configure(background= "#000000", borderwidth = 0.0)
         
-        style(self) # still insecure about this line!
+        with profile.span("style"):
+            style(self) # still insecure about this line!
         
         # Shared state
-        self.state = {
-            "genres": self.load_config("config.yaml", "genres"),
-            "studios": self.load_config("config.yaml", "studios"),
-            "anime_info": self.load_data(r"data\anime_info_processed.csv"),
-            "users_recomendations": self.load_data(r"data\anime_rec_processed.csv"),
-            "authors": authors,
-            "casey_computer_sequence": casey_computer_sequence,
-            "casey_computer_name": casey_computer_name, 
-            "fugitive": fugitive}
+        with profile.span("load anime_info"):
+            self.state = {
+                "genres": self.load_config("config.yaml", "genres"),
+                "studios": self.load_config("config.yaml", "studios"),
+                "anime_info": load_anime_info(self.load_config("config.yaml", "refresh")),
+                "authors": authors,
+                "casey_computer_sequence": casey_computer_sequence,
+                "casey_computer_name": casey_computer_name, 
+                "fugitive": fugitive}
+
+        # The query layer (see query_engine.py), indexes built once.
+        with profile.span("build indexes"):
+            engine = QueryEngine(self.state["anime_info"], self.state["genres"], self.state["studios"],
+                                 recomendations = lambda: load_recomendations(self.load_config("config.yaml", "refresh")),
+                                 search = self.load_config("config.yaml", "search"),
+                                 deep_similar = self.load_config("config.yaml", "deep_similar"))
+            self.state["engine"] = engine
+            self.state["titles_index"] = engine.titles_index
+
+        # Built on first use, see get_state.
+        self.deferred = {
+            "recomendations_graph": engine.recomendations_graph,
+            "fuzzy_search": engine.fuzzy_search,
+            "jikan_cache": self.load_jikan_cache,
+            "jikan_scheduler": self.load_jikan_scheduler,
+            "prefetcher": self.load_prefetcher,
+            "covers": self.load_covers,
+            "favorites": lambda: FavoritesStore("saved_titles.log", legacy = "saved_titles.csv")}
+        self.state["prefetch"] = self.load_config("config.yaml", "jikan")["prefetch"]
         
-        self.image_loader(filepath = r"misc\gui_design.png", x_loc = 0, y_loc = 0)
+        # Drives every GIF and rolling text (see animation.py).
+        self.state["animation_clock"] = AnimationClock(self)
+        self.state["typewriter_slots"] = {}
+        self.state["typewriter_home"] = {}
+        self.state["status_text"] = None
+        self.state["typewriter_instant"] = self.load_config("config.yaml", "typewriter")["instant"]
+
+        with profile.span("background image"):
+            self.image_loader(filepath = os.path.join("misc", "gui_design.png"), x_loc = 0, y_loc = 0)
         
-        self.animation_sequence()
+        with profile.span("animation sequence"):
+            self.animation_sequence()
 
-        self.cbox(self.state["genres"], row = 1, exploration = self.threeview_window)
-        self.cbox(self.state["studios"], row = 2, exploration = self.threeview_window)
-        
-        self.search_box()
-        
-        self.favorites_button()
-        self.return_to_home()
-        self.delete_favorites_button()
+        with profile.span("widgets"):
+            # Persistent views, updated in place by every query.
+            self.state["results_pane"] = ResultsPane(self, x_loc = 456, y_loc = 460, orders = engine.sort_orders)
+            self.state["cover_label"] = None
+
+            self.cbox(self.state["genres"], row = 1, exploration = self.threeview_window)
+            self.cbox(self.state["studios"], row = 2, exploration = self.threeview_window)
+            
+            self.search_box()
+            
+            self.favorites_button()
+            self.return_to_home()
+            self.delete_favorites_button()
         
+        # Runtime timings (see perf_monitor.py), F12 shows them.
+        perf_config = self.load_config("config.yaml", "perf")
+        if perf or perf_config["enabled"]:
+            monitor.configure(perf_config["log_path"], max_bytes = perf_config["log_max_bytes"], backups = perf_config["log_backups"],
+                              lag_threshold = perf_config["lag_threshold"])
+            monitor.watch_loop(self, interval = perf_config["lag_interval"])
+            overlay = PerfOverlay(self, monitor, caches = self.cache_stats)
+            self.bind("<F12>", lambda _: overlay.toggle())
+
         self.update_idletasks()
+
+        if startup_profile:
+            self.after_idle(profile.report) # first idle moment: the window is interactive.
+
+    def get_state(self, key:str):
+        """
+        Returns a shared state entry. Deferred entries (recommendations, fuzzy search) are built on first use.
+
+        Args:
+            key (str): The state key.
+        """
+        if key not in self.state:
+            with profile.span(f"deferred {key}"):
+                self.state[key] = self.deferred[key]()
+        return self.state[key]
+
+    def cache_stats(self):
+        """
+        Returns:
+            dict: Hit/miss counters of the Jikan and cover caches, once opened.
+        """
+        return {name: self.state[key].stats() for name, key in (("jikan", "jikan_cache"), ("covers", "covers")) if key in self.state}
+
+    def load_jikan_cache(self):
+        """
+        Opens the persistent Jikan response cache. Only needed once the API is first called.
+        """
+        from jikan_cache import JikanCache
+
+        config = self.load_config("config.yaml", "jikan")
+        return JikanCache(config["cache_path"], ttl = config["cache_ttl"], max_bytes = config["cache_max_bytes"])
+
+    def load_jikan_scheduler(self):
+        """
+        Starts the scheduler every Jikan request goes through (rate limit, pooling, coalescing, retries).
+        """
+        from jikan_scheduler import JikanScheduler
+
+        config = self.load_config("config.yaml", "jikan")
+        return JikanScheduler(self.get_state("jikan_cache"), base_url = config["base_url"], rate = config["rate_per_second"], burst = config["burst"])
+
+    def load_covers(self):
+        """
+        Creates the cover art loader and its thumbnail cache. Only needed once a title is first opened.
+        """
+        from covers import CoverCache
+
+        config = self.load_config("config.yaml", "covers")
+        return CoverCache(config["cache_dir"], max_bytes = config["cache_max_bytes"])
+
+    def load_prefetcher(self):
+        """
+        Creates the background prefetcher. Only used when jikan.prefetch is enabled in config.yaml.
+        """
+        from prefetch import Prefetcher
+
+        return Prefetcher(self.get_state("jikan_scheduler"), self.state["titles_index"], top_n = self.state["prefetch"]["top_n"],
+                          covers = self.get_state("covers"), cover_size = (364, 325))
+
+    def prefetch(self, titles = ()):
+        """
+        Warms the Jikan details of the top rows of a result view. Opt-in. Called on every view change, queued
+        prefetches of the previous view are dropped.
+
+        Args:
+            titles (pd.Series, optional): Titles of the view just rendered, in display order. None to be warmed.
+        """
+        if not self.state["prefetch"]["enabled"] or (not len(titles) and "prefetcher" not in self.state):
+            return # nothing was queued yet.
+
+        prefetcher = self.get_state("prefetcher")
+        prefetcher.view_changed(titles[:prefetcher.top_n])
+
+    def prefetch_hover(self, value:str):
+        """
+        Callback event binded to the results pane. Warms the Jikan details of the row under the cursor. Opt-in.
+
+        Args:
+            value (str): The hovered title.
+        """
+        if self.state["prefetch"]["enabled"]:
+            self.get_state("prefetcher").hover(value)
         
     def image_loader(self, filepath:str, x_loc:int, y_loc:int):
 
@@ -77,16 +210,18 @@ class AnimeApp(tk.Tk):
             bg_label.place(x = x_loc, y = y_loc)
             return bg_image
         else:
-            frames = [ImageTk.PhotoImage(frame.copy()) for frame in ImageSequence.Iterator(pil_image)]
-            bg_label = tk.Label(self, image=frames[0], background = "#39FF14", borderwidth= 0.0)
-            bg_label.image = frames[0]
+            # Animated images are decoded frame by frame, on demand (see animation.py).
+            animation = GifAnimation(pil_image) if getattr(pil_image, "is_animated", False) else None
+            first_frame = animation.next_frame() if animation else ImageTk.PhotoImage(pil_image)
+            bg_label = tk.Label(self, image=first_frame, background = "#39FF14", borderwidth= 0.0)
+            bg_label.image = first_frame
             bg_label.place(x = x_loc, y = y_loc)
-            if len(frames) > 1:
-                def animate(index=0):
-                    frame = frames[index]
+            if animation:
+                def animate():
+                    frame = animation.next_frame()
                     bg_label.configure(image=frame)
-                    self.after(85, animate, (index + 1) % len(frames))
-                animate()
+                    bg_label.image = frame # the ring buffer may drop it, the label keeps it alive.
+                self.state["animation_clock"].register(bg_label, animate, interval = 85)
 
     def load_config(self, filepath:str, index:str):
 
@@ -111,36 +246,11 @@ class AnimeApp(tk.Tk):
         except Exception as e:
             raise RecursionError(f"Failed to load data. {filepath}")
         
-    def load_data(self, filepath:str, sep=None):
-
-        '''
-        Loads CSV data with optional parameters.
-            
-        Args:
-            filepath (str): Path to the dataset.
-            sep (str, optional): Type of column separator.
-
-        Returns:
-            pd.DataFrame: Loaded DataFrame.
-
-        Raises:
-            FileNotFoundError: If the file does not exist.
-            pd.errors.EmptyDataError: If the file is empty.
-            pd.errors.ParserError: If parsing fails.
-        '''
-        if not os.path.exists(filepath):
-            raise FileNotFoundError(f"File not found {filepath}")
-        try:
-            if sep is not None:
-                return pd.read_csv(filepath, sep = sep)
-            return pd.read_csv(filepath)
-        except Exception as e:
-            raise RecursionError(f"Failed to load data. {filepath}")
-
-    def typewritter_effect(self, text:str, font_size:int, break_line:int, speed:str, width_int:int, height_int:int, x_loc:int, y_loc:int, home_screen_return:bool):
+    @monitor.timed()
+    def typewritter_effect(self, text:str, font_size:int, break_line:int, speed:str, width_int:int, height_int:int, x_loc:int, y_loc:int, home_screen_return:bool, instant:bool = None):
     
         """
-        Creates a container and creates a text on the main aplication window, utilizing a typewritter effect. Updates GUI directly or based on a event.
+        Creates a container and creates a text on the main aplication window, utilizing a typewritter effect. Updates GUI based on a event, without blocking.
         
         Args:
             text (str): The string to displayed and effected.
@@ -151,42 +261,109 @@ class AnimeApp(tk.Tk):
             height_int (int): The height of the container.
             x_loc (int): The x location in perspective of the main aplication window.
             y_loc (int): The y location in perspective of the main aplication window.
-            home_screen_return (bool): Tags widget for deletion.
+            home_screen_return (bool): Tags widget to be reset by HOME. Otherwise the text is what HOME restores at this place.
+            instant (bool, optional): Prints the text at once. Defaults to typewriter.instant in config.yaml.
         Raises:
             ValueError: if the argument is improperly determined.
+        Returns:
+            tk.Text: The container, returned right away. Its `typewriter` attribute (animation.Typewriter) tells when typing is done.
         """
         # variables.
-        string_var = tk.StringVar()
-        
-        label = tk.Text(self,
-            background="#000000",
-            foreground="#39FF14",
-            borderwidth= 0.0,
-            font=("Flexi IBM VGA True", font_size),
-            width = width_int,
-            height = height_int)
+        slots = self.state["typewriter_slots"]
+
+        if speed not in ("fast", "slow"):
+            raise ValueError(f"Speed argument is improperly determined.\nUse: 'fast' or 'slow'.\nUsed: {speed}")
+
+        if not home_screen_return:
+            self.state["typewriter_home"][(x_loc, y_loc)] = dict(text = text, font_size = font_size, break_line = break_line, speed = speed,
+                                                                 width_int = width_int, height_int = height_int, x_loc = x_loc, y_loc = y_loc, home_screen_return = False)
+
+        # One container per place, reused: a new text stops the previous one from typing and replaces it.
+        label = slots.get((x_loc, y_loc))
+
+        if label is not None and label.winfo_exists():
+            label.typewriter.cancel()
+            label.delete("1.0", "end")
+            label.configure(font=("Flexi IBM VGA True", font_size), width = width_int, height = height_int)
+        else:
+            label = tk.Text(self,
+                background="#000000",
+                foreground="#39FF14",
+                borderwidth= 0.0,
+                font=("Flexi IBM VGA True", font_size),
+                width = width_int,
+                height = height_int)
+            label.slot = (x_loc, y_loc)
+            slots[(x_loc, y_loc)] = label
+
         label.place(x = x_loc, y = y_loc)
+        label.lift()
         
         wrapped = re.sub(r"(.{1,%d})(?:\s+|$)" % break_line, r"\1\n", text)
 
+        # Typed from after callbacks (see animation.py), the caller does not wait for it.
         if speed == "fast":
-            for i in wrapped.split(" "):
-                j = string_var.get()
-                label.insert("end", i + " " + j)
-                self.update()
-                
+            label.typewriter = Typewriter(label, [i + " " for i in wrapped.split(" ")])
         elif speed == "slow":
-            for i in wrapped:
-                j = string_var.get()
-                label.insert("end", i + j)
-                self.update()
-        else:
-            raise ValueError(f"Speed argument is improperly determined.\nUse: 'fast' or 'slow'.\nUsed: {speed}")
+            label.typewriter = Typewriter(label, list(wrapped))
+
+        label.typewriter.start(instant = self.state["typewriter_instant"] if instant is None else instant)
         
-        if home_screen_return == True:
-            label._tag = "delete_me"
+        label._tag = "hide_me" if home_screen_return == True else ""
         
         return label
+
+    def status_line(self, text:str, linger:int = None, break_line:int = 38):
+        """
+        Types a message on the status line, above the results pane.
+
+        Args:
+            text (str): The message.
+            linger (int, optional): Transient message: milliseconds it stays once typed, then the previous status comes back.
+            break_line (int, optional): breaks a long string with \n.
+
+        Returns:
+            tk.Text: The status line.
+        """
+        # variables.
+        previous = self.state["status_text"]
+        status = self.typewritter_effect(text = text, font_size = 28, break_line= break_line, speed = "slow", width_int= 49, height_int= 1, x_loc= 462, y_loc= 388, home_screen_return = True)
+
+        if linger is None:
+            self.state["status_text"] = text
+            return status
+
+        token = status.typewriter
+
+        def restore():
+            if status.typewriter is not token: # replaced meanwhile.
+                return
+            if previous is None:
+                self.hide_widget(status)
+            else:
+                self.typewritter_effect(text = previous, font_size = 28, break_line= 38, speed = "slow", width_int= 49, height_int= 1, x_loc= 462, y_loc= 388, home_screen_return = True, instant = True)
+
+        token.on_done(lambda: status.after(linger, restore))
+        return status
+
+    def hide_widget(self, widget:tk.Widget):
+        """
+        Resets a persistent widget for the home screen: a text placed where the home screen had one gets it back,
+        anything else is emptied and unmapped (kept for reuse).
+
+        Args:
+            widget (tk.Widget): A widget tagged "hide_me".
+        """
+        slot = getattr(widget, "slot", None)
+
+        if slot in self.state["typewriter_home"]:
+            self.typewritter_effect(**self.state["typewriter_home"][slot], instant = True)
+            return
+
+        if hasattr(widget, "typewriter"):
+            widget.typewriter.cancel()
+            widget.delete("1.0", "end")
+        widget.place_forget()
     
     def rolling_effect(self, text:str, font_size:int, width_int:int, height_int:int, x_loc:int, y_loc:int):
             """ 
@@ -212,9 +389,12 @@ class AnimeApp(tk.Tk):
             height = height_int)
             label.place(x = x_loc, y = y_loc)
 
-            def animate(i=0):
-                if i >= len(text):
-                    return
+            steps = iter(range(len(text)))
+
+            def animate():
+                i = next(steps, None)
+                if i is None:
+                    return False
                 
                 calc = len(text) - i
                 string = " " * calc + text[:i + 1]
@@ -222,9 +402,8 @@ class AnimeApp(tk.Tk):
                 label.delete("1.0", "end")
                 label.insert("end", "".join(string))
 
-                label.after(240, animate, i + 1)
-
             animate()
+            self.state["animation_clock"].register(label, animate, interval = 240)
 
     def animation_sequence(self):
         """
@@ -233,22 +412,25 @@ class AnimeApp(tk.Tk):
         """
         
         #variables.
-        random_int = np.random.randint(1,3)
+        random_int = random.randint(1,2)
+
+        def authors_sequence():
+            # replaces the boot sequence, as both use the same places.
+            authors_name = self.typewritter_effect(text= authors[f"{random_int}"], font_size= 28, speed= "slow", break_line = 38, width_int = 25, height_int = 1, x_loc = 27, y_loc = 29, home_screen_return= False)
+            authors_message = self.typewritter_effect(text = messages[f"{random_int}"],font_size= 17, speed= "fast", break_line = 38, width_int = 40, height_int = 14, x_loc = 27, y_loc = 102, home_screen_return = False)
 
         title_animation = self.typewritter_effect(text = casey_computer_name["1"], font_size= 28, speed= "slow", break_line = 38, width_int = 25, height_int = 1, x_loc = 27, y_loc = 29, home_screen_return = False) 
         poem_animation = self.typewritter_effect(text = casey_computer_sequence["1"], font_size= 17, speed= "slow", break_line = 38, width_int = 40, height_int = 14, x_loc = 27, y_loc = 102, home_screen_return = False) 
         
-        title_animation.after(120, title_animation.destroy)
-        poem_animation.after(120, poem_animation.destroy)
-
-        authors_name = self.typewritter_effect(text= authors[f"{random_int}"], font_size= 28, speed= "slow", break_line = 38, width_int = 25, height_int = 1, x_loc = 27, y_loc = 29, home_screen_return= False)
-        authors_message = self.typewritter_effect(text = messages[f"{random_int}"],font_size= 17, speed= "fast", break_line = 38, width_int = 40, height_int = 14, x_loc = 27, y_loc = 102, home_screen_return = False)
-        human_incomplete_image = self.image_loader(filepath = r"misc\incomplete_resized.gif", x_loc= 26, y_loc = 459)
-        neon_city_image = self.image_loader(filepath = r"misc\contender_resized.gif", x_loc= 456, y_loc = 24)
-        map_city_image = self.image_loader(filepath=  r"misc\map_with_effect_resized.png", x_loc= 457, y_loc= 460)  
-        fugitive_image = self.image_loader(filepath = r"misc\kav_effect_resized.png", x_loc = 846, y_loc = 26)
+        # Never runs if a title is opened meanwhile (its synopsis takes the place of the poem).
+        poem_animation.typewriter.on_done(lambda: self.after(120, authors_sequence))
+
+        human_incomplete_image = self.image_loader(filepath = os.path.join("misc", "incomplete_resized.gif"), x_loc= 26, y_loc = 459)
+        neon_city_image = self.image_loader(filepath = os.path.join("misc", "contender_resized.gif"), x_loc= 456, y_loc = 24)
+        map_city_image = self.image_loader(filepath=  os.path.join("misc", "map_with_effect_resized.png"), x_loc= 457, y_loc= 460)  
+        fugitive_image = self.image_loader(filepath = os.path.join("misc", "kav_effect_resized.png"), x_loc = 846, y_loc = 26)
         fugitive_status = self.typewritter_effect(text = fugitive["1"], font_size= 15, break_line= 30, speed = "slow", height_int= 7, width_int= 32, x_loc= 997, y_loc= 28, home_screen_return = False)
-        ghost_gif = self.image_loader(filepath = r"misc\ghost_image_resized.gif", x_loc = 845, y_loc = 200)
+        ghost_gif = self.image_loader(filepath = os.path.join("misc", "ghost_image_resized.gif"), x_loc = 845, y_loc = 200)
         rolling_message = self.rolling_effect(text = rolling_type_message[f"{random_int}"], font_size = 38, width_int= 55, height_int = 1, x_loc= 27, y_loc= 748)
 
     def cbox(self, text:str, row:int, exploration:callable):
@@ -282,6 +464,7 @@ class AnimeApp(tk.Tk):
 
         label_choosen.bind("<<ComboboxSelected>>", lambda _ : exploration(label_choosen.get()))
 
+    @monitor.timed()
     def threeview_window(self, value:tk.StringVar):
 
         """
@@ -294,56 +477,36 @@ class AnimeApp(tk.Tk):
         # variables
         selected = value
         data = self.state["anime_info"]
+        answer = self.state["engine"].browse(selected)
 
-        # container
-        window = tk.Frame(master = self, borderwidth= 0.0)
-        window.place(x = 456, y = 460)
-        window._tag = "delete_me"
-
-        if selected in self.state["genres"]:
+        if answer is None:
+            return
 
-            filtered_data = data[data["Genres"].str.contains(selected, na=False)]
-            sorted_data = filtered_data.sort_values("Completed_count", ascending = False)
-            sorted_data.drop(["Unnamed: 0", "Anime_id", "Completed_count", "Genres"], axis = 1, inplace = True)
+        status = f"Sorted by: {selected}" if answer["kind"] == "genre" else f"From: {selected}"
 
-            sorted_by_status = self.typewritter_effect(text = f"Sorted by: {selected}", font_size = 28, break_line= 38, speed = "slow", width_int= 49, height_int= 1, x_loc= 462, y_loc= 388, home_screen_return= True)
-            
-            tree = ttk.Treeview(window, columns=list(sorted_data.columns), show="headings")
-            tree._tag = "delete_me"
-                
-            for column in sorted_data.columns:
-                tree.heading(column, text=column)
-            for _, row in sorted_data.iterrows():
-                tree.insert("", "end", values=list(row))
-                
-            tree.pack(expand=True, fill='both')
-            
-            tree.bind("<Double-1>", lambda event: self.recursive_event(tree.item(tree.identify_row(event.y))["values"][0]), add='+')
-            tree.bind("<Double-1>", lambda event: self.jikan_api(tree.item(tree.identify_row(event.y))["values"][0]), add='+')
-            tree.bind("<Button-3>", lambda event: self.file_favorite_treatment(tree.item(tree.identify_row(event.y))["values"][0]), add='+') # New.
-
-        elif selected in self.state["studios"]:
-            
-            filtered_data = data[data["Studios"].str.contains(selected, na=False)]
-            sorted_data = filtered_data.sort_values("Completed_count", ascending = False)
-            sorted_data.drop(["Unnamed: 0", "Anime_id", "Completed_count", "Genres"], axis = 1, inplace = True)
+        sorted_data = data.iloc[answer["positions"]] # already ranked by Completed_count.
+        sorted_data = sorted_data.drop(["Unnamed: 0", "Anime_id", "Completed_count", "Genres"], axis = 1)
 
-            sorted_by_status = self.typewritter_effect(text = f"From: {selected}", font_size = 28, break_line= 38, speed = "slow", width_int= 49, height_int= 1, x_loc= 462, y_loc= 388, home_screen_return = True)
+        sorted_by_status = self.status_line(status)
 
-            tree = ttk.Treeview(window, columns=list(sorted_data.columns), show="headings")
-            tree._tag = "delete_me"
+        self.state["results_pane"].show(sorted_data,
+                                        sortable = True,
+                                        double_click = self.explore_title,
+                                        right_click = self.file_favorite_treatment,
+                                        hover = self.prefetch_hover)
+        self.prefetch(sorted_data["Title"])
 
-            for column in sorted_data.columns:
-                tree.heading(column, text=column)
-            for _, row in sorted_data.iterrows():
-                tree.insert("", "end", values=list(row))
-                
-            tree.pack(expand=True, fill='both')
+    def explore_title(self, value:tk.StringVar):
+        """
+        Callback event binded to the results pane. Shows the titles similar to the selected one, and its API widgets.
 
-            tree.bind("<Double-1>", lambda event: self.recursive_event(tree.item(tree.identify_row(event.y))["values"][0]), add='+')
-            tree.bind("<Double-1>", lambda event: self.jikan_api(tree.item(tree.identify_row(event.y))["values"][0]), add='+')
-            tree.bind("<Button-3>", lambda event: self.file_favorite_treatment(tree.item(tree.identify_row(event.y))["values"][0]), add='+') # New.
+        Args:
+            value (str): The title selected.
+        """
+        self.recursive_event(value)
+        self.jikan_api(value)
 
+    @monitor.timed()
     def recursive_event(self, event:tk.StringVar):
         """
         Callback event binded to threeview_window. Uses the user returned value to diplay a ttk.Treeview recomendation three. Binds the inputted value and diplays API widgets feature.
@@ -356,91 +519,66 @@ class AnimeApp(tk.Tk):
         # variables.
         selected = event
         data = self.state["anime_info"]
-        data = self.state["anime_info"]
-        user_recomendations = self.state["users_recomendations"]
-
+        engine = self.state["engine"]
 
-        if (data["Title"] == selected).any():
-
-            filtered_data = data[data['Title'] == selected]['Anime_id'].iloc[0]
-            grouped_data = user_recomendations[user_recomendations['Animea'] == filtered_data].groupby('Num_recommenders').first()
-            index_data_sorted = grouped_data.sort_values(by = ['Num_recommenders'], ascending = False)
-            recomendation_data = data[data['Anime_id'].isin(index_data_sorted['Animeb'].values)]  
-            
-            user_data = recomendation_data.copy()
-            user_data.drop(["Unnamed: 0", "Anime_id", "Completed_count", "Genres"], axis = 1, inplace = True)
-
-            similar_to_statues = self.typewritter_effect(text = f"Similar to: {selected}", font_size = 28, break_line= 38, speed = "slow", width_int= 49, height_int= 1, x_loc= 462, y_loc= 388, home_screen_return = True)
+        if selected in engine.titles_index:
 
+            self.get_state("recomendations_graph") # profiled on first use.
+            answer = engine.similar(selected)
+            selected = answer["title"] # the title as spelled in the dataset.
 
-            window = tk.Frame(master = self, borderwidth= 0.0)
-            window.place(x = 456, y = 460)
-            window._tag = "delete_me"
+            # Obscure titles have few pairs: titles a few hops away are scored instead (deep similar).
+            status = f"Deep similar to: {selected}" if answer["kind"] == "deep" else f"Similar to: {selected}"
 
-            tree = ttk.Treeview(window, columns=list(user_data.columns), show="headings")
-            tree._tag = "delete_me"
-
-            for column in user_data.columns:
-                tree.heading(column, text=column)
-            for _, row in user_data.iterrows():
-                tree.insert("", "end", values=list(row))
+            recomendation_data = data.iloc[answer["positions"]]
+            
+            user_data = recomendation_data.drop(["Unnamed: 0", "Anime_id", "Completed_count", "Genres"], axis = 1)
 
-            tree.pack( expand=True, fill='both')
+            similar_to_statues = self.status_line(status)
 
-            tree.bind("<Double-1>", lambda event: self.jikan_api(tree.item(tree.identify_row(event.y))["values"][0]))
-            tree.bind("<Button-3>", lambda event: self.file_favorite_treatment(tree.item(tree.identify_row(event.y))["values"][0]), add='+') # New.
+            self.state["results_pane"].show(user_data,
+                                            sortable = True,
+                                            double_click = self.jikan_api,
+                                            right_click = self.file_favorite_treatment,
+                                            hover = self.prefetch_hover)
+            self.prefetch(user_data["Title"])
 
         else: # Always if the search bar has found nothing.
             
             # variables.
             user_query = selected
-            choices = data["Title"]
-
-            what_did_you_mean_status = self.typewritter_effect(text = f"What did you mean? ", font_size = 28, break_line= 38, speed = "slow", width_int= 49, height_int= 1, x_loc= 462, y_loc= 388, home_screen_return= True)
-            
-            best_match = process.extract(user_query, choices)
-            temp_names = []
-
-            if best_match:
-                for i in best_match:
-                    temp_names.append(*i[0:1])
-
-            user_data_did_you_mean = pd.DataFrame({"Title": temp_names})
 
-            window = tk.Frame(master = self, borderwidth= 0.0)
-            window.place(x = 456, y = 460)
-            window._tag = "delete_me"
-
-            tree = ttk.Treeview(window, columns=list(user_data_did_you_mean.columns), show="headings")
-            tree._tag = "delete_me"
+            what_did_you_mean_status = self.status_line("What did you mean? ")
             
-            tree.column("Title", width=800, stretch=False) # This makes sure that the spanwed tree fits the aplication. 
+            self.get_state("fuzzy_search") # profiled on first use.
+            best_match = engine.did_you_mean(user_query)
 
-            for column in user_data_did_you_mean.columns:
-                tree.heading(column, text=column)
-            for _, row in user_data_did_you_mean.iterrows():
-                tree.insert("", "end", values=list(row))
+            user_data_did_you_mean = data.iloc[best_match["positions"]][["Title"]]
 
-            tree.pack( expand=True, fill='both' )
-            
-            tree.bind("<Button-3>", lambda event: self.file_favorite_treatment(tree.item(tree.identify_row(event.y))["values"][0]), add='+')
+            # The fixed width makes sure that the tree fits the aplication. 
+            self.state["results_pane"].show(user_data_did_you_mean,
+                                            widths = {"Title": 800},
+                                            sortable = True,
+                                            double_click = self.explore_title,
+                                            right_click = self.file_favorite_treatment)
+            self.prefetch(user_data_did_you_mean["Title"])
 
             """
             NOTE:
 
-            If the first condition is False, a tree will be spawn to display alternatives using the levenshtein distance in reference to the inputted value.
+            If the first condition is False, a tree will be spawn to display alternatives using the levenshtein distance in reference to the inputted value. Only titles sharing trigrams
+            with the query are scored (see fuzzy_search.py).
             
             Also, this tree will also be binded to recursive_event, which will call upon itself, and then, the first condition will be True. Given the is drawn uppon the very same Database, won't be a dismatch.
             
             More on Levenshtein distance: https://en.wikipedia.org/wiki/Levenshtein_distance
             """
 
-            tree.bind("<Double-1>", lambda event: self.recursive_event(tree.item(tree.identify_row(event.y))["values"][0]), add='+')
-            tree.bind("<Double-1>", lambda event: self.jikan_api(tree.item(tree.identify_row(event.y))["values"][0]), add='+')
-
+    @monitor.timed()
     def jikan_api(self, event:tk.StringVar):
         """
         Callback event binded to threeview_window and recursive_event. Uses Jikanpy-V4 API to request two JSON files about the user inputted value.
+        Requests go through the shared scheduler (see jikan_scheduler.py) and a persistent cache (see jikan_cache.py).
 
         Args:
             value (ttk.Combobox.get| tk.StringVar): The string selected from threeview_window and recursive_event.
@@ -450,58 +588,45 @@ class AnimeApp(tk.Tk):
         # Variables
 
         value = event
-        raw_data = self.state["anime_info"]
-        anime_id = int(raw_data[raw_data["Title"] == value]["Anime_id"].values[0])
-        
-        # Queue for thread results
-        result_queue = queue.Queue()
+        found = self.state["titles_index"].lookup(value)
 
-        def worker():
-            try:
-                j = Jikan()
-                data_info = j.anime(anime_id)
-                data_reviews = j.anime(anime_id, extension="reviews")
-                time.sleep(1)
-                result_queue.put(("ok", data_info, data_reviews))
-            except Exception as e:
-                result_queue.put(("error", str(e)))
+        if found is None:
+            return
 
-        # Launch thread
-        threading.Thread(target=worker, daemon=True).start()
+        anime_id, _ = found
+        scheduler = self.get_state("jikan_scheduler")
 
-        # Poll the queue without blocking UI
+        # Clicked titles jump ahead of any background request, repeated clicks share the in-flight request.
+        submitted = time.perf_counter()
+        info_request = scheduler.submit("anime", anime_id)
+        reviews_request = scheduler.submit("reviews", anime_id)
+
+        # Poll the requests without blocking UI
         def check_queue():
-            try:
-                status, *payload = result_queue.get_nowait()
-            except queue.Empty:
+            if not (info_request.done() and reviews_request.done()):
                 self.after(20, check_queue)
                 return
-            
-            if status == "ok":
-                data_info, data_reviews = payload
+
+            monitor.record("jikan_wait", time.perf_counter() - submitted, anime_id = anime_id)
+
+            try:
+                data_info, data_reviews = info_request.result(), reviews_request.result()
+            except Exception as e:
+                error_message = str(e)
+                self.status_line(f"Error: {error_message}")
+            else:
                 self.load_api_widgets(data_info)
                 self.load_api_reviews(data_reviews)
-            else:
-                error_message = payload[0]
-                self.typewritter_effect(
-                    text=f"Error: {error_message}",
-                    font_size=28,
-                    break_line=38,
-                    speed="slow",
-                    width_int=49,
-                    height_int=1,
-                    x_loc=462,
-                    y_loc=388,
-                    home_screen_return=True
-                )
 
         # Start polling
         self.after(100, check_queue)
 
+    @monitor.timed()
     def image_loader_url(self, url:str, x_resize:int, y_resize:int):
         
         """
-        Loads the image from a URL.  
+        Loads the image from a URL. Download, decoding and resizing run on a worker through the thumbnail cache (see covers.py),
+        the event loop only polls for the result and creates the PhotoImage.
 
         Args:
             x_resize (int| Image.open.resize): To resize the image based on a given x axis.  
@@ -512,18 +637,40 @@ class AnimeApp(tk.Tk):
             OSError: for I/O related errors.
 
         """
-        try: 
-            
-            pil_image = Image.open(requests.get(url, stream=True).raw).resize(size = (x_resize, y_resize))# A little to crypt for my taste.
-            tk_image = ImageTk.PhotoImage(pil_image)
-            image_label = tk.Label(self, image=tk_image, background= "#000000", borderwidth= 0.0)
-            image_label._tag = "delete_me"
-            image_label.image = tk_image # avoids tkinter garbage collector.
-            image_label.place(x = 455, y = 24)
-        
-        except (requests.exceptions.RequestException, UnidentifiedImageError, OSError) as e:
+        submitted = time.perf_counter()
+        request = self.get_state("covers").submit(url, (x_resize, y_resize))
+
+        def check_request():
+            if not request.done():
+                self.after(20, check_request)
+                return
+
+            monitor.record("cover_wait", time.perf_counter() - submitted)
+
+            import requests
+
+            try: 
+                
+                pil_image = request.result()
+                tk_image = ImageTk.PhotoImage(pil_image)
+
+                # One cover label, reused by every title.
+                image_label = self.state["cover_label"]
+                if image_label is None:
+                    image_label = tk.Label(self, background= "#000000", borderwidth= 0.0)
+                    image_label._tag = "hide_me"
+                    self.state["cover_label"] = image_label
+
+                image_label.configure(image=tk_image)
+                image_label.image = tk_image # avoids tkinter garbage collector.
+                image_label.place(x = 455, y = 24)
+                image_label.lift()
             
-            print(f"Error loading image: {e}")
+            except (requests.exceptions.RequestException, UnidentifiedImageError, OSError) as e:
+                
+                print(f"Error loading image: {e}")
+
+        check_request()
 
     def load_api_widgets(self, value:tk.StringVar):
 
@@ -543,6 +690,7 @@ class AnimeApp(tk.Tk):
         image_widget = self.image_loader_url(url = response_image, x_resize = 364, y_resize = 325)
         synopsis_widget = self.typewritter_effect(text = response_synopsis, font_size= 17, speed= "fast", break_line = 38, width_int = 40, height_int = 14, x_loc = 27, y_loc = 102, home_screen_return= True)
 
+    @monitor.timed()
     def load_api_reviews(self, value:tk.StringVar):
         """
         Callback event binded to jikan_api. Assembles reviews and displays onto the screen. Updates GUI directly.
@@ -565,7 +713,7 @@ class AnimeApp(tk.Tk):
     def search_box(self):
 
         """
-        Creates a search box for a given string in the main aplication window. Capitalizes the returned string for a better matching. Updates the GUI directly. Binds the returned inputted value to recursive_event.
+        Creates a search box for a given string in the main aplication window. Updates the GUI directly. Binds the returned inputted value to recursive_event.
         
         """
         # variable.
@@ -574,26 +722,16 @@ class AnimeApp(tk.Tk):
         
         search_entry = tk.Entry(self, textvariable = _ , background="#39FF14", foreground="#080B08", font= font_and_size, width= 15)
         search_entry.place(x = 1140, y = 146)
-            
-        def capitalize_after_space(text:str):
-            """
-            Capitalizes strings after space (internally).
+        self.state["search_entry"] = search_entry
 
-            Args:
-                text (str) = A string to be processed.
-            """
-            words = text.split(' ')  
-            capitalized_words = [word.capitalize() for word in words]
-            return ' '.join(capitalized_words)
-
-
-        search_entry.bind("<Return>", lambda event: (self.recursive_event(capitalize_after_space((search_entry.get()))), 
+        # recursive_event matches titles case-insensitively through the title index.
+        search_entry.bind("<Return>", lambda event: (self.recursive_event(search_entry.get()), 
                                                     search_entry.delete(0, "end")))
 
     def return_to_home(self):
 
         """
-        Creates button to return to home screen. Widgets to be deleted maped previosly. Updates GUI directly.
+        Creates button to return to home screen. Widgets to be reset maped previosly, they are hidden and kept for reuse. Updates GUI directly.
 
         """
             
@@ -602,11 +740,13 @@ class AnimeApp(tk.Tk):
 
 
         def delete_widgets():
-            for w in self.winfo_children():
-                if getattr(w, "_tag", "") == "delete_me":
-                    w.destroy()
-
+            self.state["status_text"] = None
+            self.state["results_pane"].hide()
+            self.prefetch()
 
+            for w in self.winfo_children():
+                if getattr(w, "_tag", "") == "hide_me":
+                    self.hide_widget(w)
 
 
         button = tk.Button(close_window_frame, text = "HOME", command = lambda: delete_widgets(),
@@ -619,78 +759,53 @@ class AnimeApp(tk.Tk):
 
     def file_favorite_treatment(self, value:tk.StringVar):
         """
-        Callback event. Informs the user if a title have been added into the favorites. Creates a CSV file with the user favorite animes. Updates the GUI directly.
+        Callback event. Informs the user if a title have been added into the favorites. Favorites are kept in memory and logged to saved_titles.log (see favorites.py). Updates the GUI directly.
         """
         # variables.
         selected = value
-        filepath = "saved_titles.csv"
-        saved_files = []
         
         if selected:
 
-            favorite_status = self.typewritter_effect(text = f"{selected} has been favorited.", font_size = 28, break_line= 38, speed = "slow", width_int= 49, height_int= 1, x_loc= 462, y_loc= 388, home_screen_return= True)
-            favorite_status.after(600, favorite_status.destroy)
-
-            if not os.path.isfile(filepath):
-                with open(file = filepath, mode = "w", newline = "") as file:
-                    writer = csv.writer(file)
-                    writer.writerow(["Title"])
-                    writer.writerow([selected])
-            else:
-                with open(filepath, "r", newline="") as file:
-                    reader = csv.reader(file)
-                    for row in reader:
-                        if row:
-                            saved_files.append(row[0])
-
-                if selected not in saved_files:
-                    with open(filepath, "a", newline="") as file:
-                        writer = csv.writer(file)
-                        writer.writerow([selected])
+            favorite_status = self.status_line(f"{selected} has been favorited.", linger = 600)
 
-    def favorites_button(self):
+            self.get_state("favorites").add(selected)
 
-            """
-            Callback event. Creates a button and commands a ttk.three to spawn containing the user favorite titles. Updates GUI directly.
-            """
-
-            # variables. 
-            filepath = "saved_titles.csv"
-
-            def favorite_tree():
-
-                if os.path.isfile(filepath):
-
-                    window = tk.Frame(master = self, borderwidth= 0.0)
-                    window.place(x = 456, y = 460)
-                    window._tag = "delete_me"
-
-                    sorted = pd.read_csv(filepath)
-                
-                    sorted.reset_index(drop=True, inplace=True)
-
-                    sorted.columns = ["Favorites"]
+    def unfavorite(self, value:str):
+        """
+        Callback event binded to the favorites view. Removes a single title from the favorites, then refreshes the view.
 
-                    tree = ttk.Treeview(window,columns=list(sorted.columns),show="headings")
+        Args:
+            value (str): The title selected.
+        """
+        if self.get_state("favorites").remove(value):
+            favorite_status = self.status_line(f"{value} has been removed.", linger = 600)
 
-                    tree.column("#0", width=0, stretch=False)
-                    tree.column("Favorites", width=798, stretch=False)
+            if not len(self.get_state("favorites")): # the last one, nothing left to show.
+                self.state["results_pane"].hide()
+                self.prefetch()
 
-                    for column in sorted.columns:
-                        tree.heading(column, text=column)
+            self.favorite_tree()
 
-                    for row in sorted.itertuples(index=False):
-                        tree.insert("", "end", values=row)
-                                            
-                    tree.pack(expand=True, fill='both')
+    def favorite_tree(self):
+        """
+        Displays the user favorite titles in the results pane, oldest first. Right-click removes one.
+        """
+        favorites = self.get_state("favorites")
+
+        if len(favorites):
+            self.state["results_pane"].show(pd.DataFrame({"Favorites": list(favorites)}),
+                                            widths = {"Favorites": 798},
+                                            double_click = self.explore_title,
+                                            right_click = self.unfavorite)
+            self.prefetch()
+        else:
+            favorite_status = self.status_line("No favorites yet.", linger = 550, break_line = 50)
 
-                    tree.bind("<Double-1>", lambda event: self.recursive_event(tree.item(tree.identify_row(event.y))["values"][0]), add='+')
-                    tree.bind("<Double-1>", lambda event: self.jikan_api(tree.item(tree.identify_row(event.y))["values"][0]), add='+')
+    def favorites_button(self):
 
-                else:
-                    favorite_status = self.typewritter_effect(text = f"No favorites yet.", font_size = 28, break_line= 50, speed = "slow", width_int= 49, height_int= 1, x_loc= 462, y_loc= 388, home_screen_return= True)
-                    favorite_status.after(550, favorite_status.destroy)
-                
+            """
+            Callback event. Creates a button and commands a ttk.three to spawn containing the user favorite titles. Updates GUI directly.
+            """
             
             close_window_frame = tk.Label(self, borderwidth= 0 )
             close_window_frame.place(x = 1178, y = 28)
@@ -698,7 +813,7 @@ class AnimeApp(tk.Tk):
             
             button = tk.Button(close_window_frame,
                                text = "SAVED",
-                               command = lambda: favorite_tree(),
+                               command = self.favorite_tree,
                                background="#39FF14",
                                foreground="#000000",
                                font=("Flexi IBM VGA True", 11)
@@ -709,17 +824,16 @@ class AnimeApp(tk.Tk):
     def delete_favorites_button(self):
 
         """
-        Deletes file containing user favorites. Informs the user about the operation.
+        Deletes every user favorite. Informs the user about the operation.
         """
-        # variables.
-        filepath = "saved_titles.csv"
 
         def favorite_deletion():
-            if os.path.isfile(filepath):
-                os.remove(filepath)
+            favorites = self.get_state("favorites")
+
+            if len(favorites):
+                favorites.clear()
             else:
-                favorite_status = self.typewritter_effect(text = f"No favorites to delete.", font_size = 28, break_line= 50, speed = "slow", width_int= 49, height_int= 1, x_loc= 462, y_loc= 388, home_screen_return= True)
-                favorite_status.after(550, favorite_status.destroy)
+                favorite_status = self.status_line("No favorites to delete.", linger = 550, break_line = 50)
 
         close_window_frame = tk.Label(self, borderwidth= 0 )
         close_window_frame.place(x = 1148, y = 28)
@@ -738,9 +852,12 @@ class AnimeApp(tk.Tk):
 
 
 if __name__ == "__main__":
-    app = AnimeApp()
+    app = AnimeApp(startup_profile = "--startup-profile" in sys.argv[1:], perf = "--perf" in sys.argv[1:])
     app.mainloop()
 
+    if "favorites" in app.state: # pending changes made durable.
+        app.state["favorites"].close()
+
 # Make sure the font is present in os.
 # Add more messages.
 
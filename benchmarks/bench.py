@@ -0,0 +1,211 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic_data import generate, GENRES
+from data import data_processing
+from fuzzy_search import FuzzySearch
+from indexes import RecommendationGraph
+from query_engine import QueryEngine
+
+
+'''
+NOTE: Benchmarks of the data layer hot paths, on synthetic datasets (see synthetic_data.py), fully offline. Every case
+is timed over a few runs (median and min), then run once more under tracemalloc for its peak memory. Run from the
+repository root:
+
+    python -m benchmarks.bench --scales 1 10 --save benchmarks/baseline.json
+    python -m benchmarks.bench --scales 1 10 --compare benchmarks/baseline.json
+
+With --compare, cases slower (or heavier) than the baseline by more than --tolerance are reported and the exit status
+is 1, so it can gate a commit.
+'''
+
+
+def measure(call, repeat:int = 5):
+    """
+    Args:
+        call (callable): The case, without arguments.
+        repeat (int, optional): Timed runs.
+
+    Returns:
+        dict: median_s, min_s over the timed runs, peak_mb of one traced run.
+    """
+    times = []
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - begin)
+
+    # Traced apart, tracemalloc slows allocations down.
+    tracemalloc.start()
+    call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {"median_s": round(statistics.median(times), 6), "min_s": round(min(times), 6), "peak_mb": round(peak / 2**20, 3)}
+
+
+class Suite:
+    """
+    The cases of one dataset scale, run in a temporary folder holding the synthetic raw files.
+
+    Args:
+        directory (str): Working folder, the raw files are generated in it.
+        scale (float): Multiple of the current dataset size.
+        repeat (int, optional): Timed runs per case.
+        queries (int, optional): Queries per lookup case, sampled once.
+        seed (int, optional): Seed of the dataset and of the samples.
+    """
+
+    def __init__(self, directory:str, scale:float, repeat:int = 5, queries:int = 200, seed:int = 0):
+
+        # variables.
+        self.directory = directory
+        self.scale = scale
+        self.repeat = repeat
+        self.queries = queries
+        self.rng = np.random.default_rng(seed)
+        self.results = {}
+
+        generate(directory, scale, seed)
+
+    def case(self, name:str, call, repeat:int = None):
+        self.results[name] = measure(call, repeat or self.repeat)
+        print(f"  {name:<28} {self.results[name]['median_s'] * 1000:>11.3f} ms {self.results[name]['peak_mb']:>10.1f} MB", file = sys.stderr)
+
+    def run(self):
+        """
+        Returns:
+            dict: case -> measures.
+        """
+        os.chdir(self.directory) # data_processing.main works on the current folder.
+
+        # data_processing: the per-title steps on a parsed frame, then the whole chunked pipeline.
+        raw = pd.read_csv("anime_info.csv", sep = "\t", usecols = list(data_processing.ANIME_COLUMNS), dtype = data_processing.ANIME_COLUMNS)
+        self.case("anime_chunk_processor", lambda: data_processing.anime_chunk_processor(raw))
+        processed = data_processing.anime_chunk_processor(raw)
+        self.case("rank_anime", lambda: data_processing.rank_anime(processed.copy()))
+        self.case("pipeline_main", data_processing.main)
+
+        # load_data: parsing the processed CSV against mapping its snapshot.
+        self.case("load_csv_anime", lambda: pd.read_csv("anime_info_processed.csv"))
+        self.case("load_snapshot_anime", lambda: data_processing.load_snapshot("anime_info_processed.snapshot"))
+        self.case("load_csv_recomendations", lambda: pd.read_csv("anime_rec_processed.csv"))
+        self.case("load_snapshot_recomendations", lambda: data_processing.load_snapshot("anime_rec_processed.snapshot"))
+
+        anime_info = data_processing.load_snapshot("anime_info_processed.snapshot")
+        recomendations = data_processing.load_snapshot("anime_rec_processed.snapshot")
+        studios = anime_info["Studios"].value_counts().index[:10].tolist()
+        make_engine = lambda: QueryEngine(anime_info, GENRES, studios, lambda: recomendations)
+
+        # threeview_window: genre and studio picks.
+        self.case("engine_indexes", make_engine)
+        engine = make_engine()
+        picks = GENRES + studios
+        self.case("browse", lambda: [engine.rows(engine.browse(pick)) for pick in picks])
+
+        # Header clicks: every view re-sorted by every sortable column.
+        answers = [engine.browse(pick) for pick in picks]
+        self.case("sort_views", lambda: [engine.sort(answer, column) for answer in answers for column in engine.sort_orders.ranks])
+
+        # recursive_event: graph lookups of popular and random titles, deep similar of obscure ones.
+        self.case("graph_build", lambda: RecommendationGraph(recomendations, anime_info))
+        graph = engine.recomendations_graph()
+        titles = anime_info["Title"].dropna().to_numpy()
+        sample = titles[self.rng.integers(0, len(titles), self.queries)]
+        self.case("similar", lambda: [engine.similar(title) for title in sample])
+
+        ids = anime_info["Anime_id"].to_numpy()[self.rng.integers(0, len(anime_info), self.queries // 10)]
+        self.case("deep", lambda: [graph.deep(anime_id) for anime_id in ids])
+
+        # process.extract: misspelled titles (one character dropped).
+        misspelled = [title[:len(title) // 2] + title[len(title) // 2 + 1:] for title in sample[:self.queries // 10]]
+        self.case("fuzzy_build", lambda: FuzzySearch(anime_info["Title"]), repeat = 1)
+        engine.fuzzy_search()
+        self.case("fuzzy_extract", lambda: [engine.did_you_mean(title) for title in misspelled])
+
+        return self.results
+
+
+def compare(results:dict, baseline:dict, tolerance:float = 0.2, floor:float = 0.001):
+    """
+    Args:
+        results (dict): Results of this run, scale -> case -> measures.
+        baseline (dict): Results of a saved run.
+        tolerance (float, optional): Relative increase reported as a regression.
+        floor (float, optional): Seconds under which timings are too noisy to compare.
+
+    Returns:
+        list: One line per regression.
+    """
+    regressions = []
+
+    for scale, cases in results.items():
+        for name, measures in cases.items():
+            before = baseline.get(scale, {}).get(name)
+            if before is None:
+                continue
+
+            for key in ("median_s", "peak_mb"):
+                if key == "median_s" and max(before[key], measures[key]) < floor:
+                    continue
+                if before[key] and measures[key] > before[key] * (1 + tolerance):
+                    regressions.append(f"{scale} {name} {key}: {before[key]} -> {measures[key]} (+{measures[key] / before[key] - 1:.0%})")
+
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Data layer benchmarks on synthetic datasets.")
+    parser.add_argument("--scales", type = float, nargs = "+", default = [1, 10])
+    parser.add_argument("--repeat", type = int, default = 5)
+    parser.add_argument("--queries", type = int, default = 200)
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--save", help = "write the results to a JSON baseline.")
+    parser.add_argument("--compare", help = "JSON baseline to compare the results with.")
+    parser.add_argument("--tolerance", type = float, default = 0.2)
+    args = parser.parse_args()
+
+    # Paths are resolved before the suite moves to its temporary folders.
+    save = args.save and os.path.abspath(args.save)
+    baseline = args.compare and os.path.abspath(args.compare)
+    home = os.getcwd()
+    results = {}
+
+    for scale in args.scales:
+        key = f"{scale:g}x"
+        directory = tempfile.mkdtemp(prefix = f"bench_{key}_")
+        print(f"{key}:", file = sys.stderr)
+        try:
+            results[key] = Suite(directory, scale, repeat = args.repeat, queries = args.queries, seed = args.seed).run()
+        finally:
+            os.chdir(home)
+            shutil.rmtree(directory, ignore_errors = True)
+
+    report = {"python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__,
+              "machine": platform.machine(), "created_at": time.time(), "results": results}
+
+    if save:
+        with open(save, "w") as file:
+            json.dump(report, file, indent = 2)
+
+    if baseline:
+        with open(baseline) as file:
+            regressions = compare(results, json.load(file)["results"], tolerance = args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file = sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+    if not save:
+        print(json.dumps(report, indent = 2))
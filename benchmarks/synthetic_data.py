@@ -0,0 +1,100 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+
+'''
+NOTE: Synthetic raw datasets with the schema of anime_info.csv and user_recomendations.csv (tab separated, as read by
+data/data_processing.py), at any multiple of the current catalog size. Deterministic for a given seed, no network.
+'''
+
+# Size of the current dataset, scale 1.
+TITLES = 13379
+PAIRS = 60000
+
+GENRES = ["Action", "Adventure", "Comedy", "Drama", "Fantasy", "Horror", "Mecha", "Mystery", "Police", "Psychological",
+          "Romance", "Sci-Fi", "Slice of Life", "Sports", "Supernatural", "Kids", "Shounen", "Seinen", "Music", "School"]
+SYLLABLES = ["ka", "shi", "no", "to", "ri", "mi", "ra", "ya", "ko", "su", "ne", "hi", "ma", "gi", "chi", "bo", "tsu", "ze"]
+
+
+def words(rng:np.random.Generator, count:int, low:int, high:int):
+    """
+    Args:
+        rng (np.random.Generator): The random source.
+        count (int): Number of strings.
+        low (int): Fewest syllables per word.
+        high (int): Most syllables per word.
+
+    Returns:
+        np.ndarray: Capitalized pseudo-Japanese words.
+    """
+    lengths = rng.integers(low, high + 1, count)
+    syllables = np.array(SYLLABLES)[rng.integers(0, len(SYLLABLES), lengths.sum())]
+    return np.array(["".join(word).capitalize() for word in np.split(syllables, np.cumsum(lengths)[:-1])])
+
+def joined(rng:np.random.Generator, pool:np.ndarray, count:int, most:int):
+    """
+    Returns:
+        list: Pipe-delimited combinations of 1 to `most` items of the pool, popular items first.
+    """
+    sizes = rng.integers(1, most + 1, count)
+    picks = np.minimum(rng.zipf(1.6, sizes.sum()) - 1, len(pool) - 1)
+    return ["|".join(dict.fromkeys(items)) for items in np.split(pool[picks], np.cumsum(sizes)[:-1])]
+
+def generate(directory:str, scale:float = 1, seed:int = 0):
+    """
+    Writes anime_info.csv and user_recomendations.csv to a folder.
+
+    Args:
+        directory (str): The output folder, created if needed.
+        scale (float, optional): Multiple of the current dataset size.
+        seed (int, optional): Random seed.
+
+    Returns:
+        tuple(str, str): Paths of the anime and recommendation files.
+    """
+    rng = np.random.default_rng(seed)
+    titles, pairs = int(TITLES * scale), int(PAIRS * scale)
+    os.makedirs(directory, exist_ok = True)
+
+    anime_ids = rng.permutation(titles * 3)[:titles] + 1
+    vocabulary = words(rng, max(titles // 4, 50), 2, 4)
+    studios = np.array([f"Studio {name}" for name in words(rng, max(titles // 25, 20), 2, 3)])
+    start = pd.Timestamp("1960-01-01") + pd.to_timedelta(rng.integers(0, 60 * 365, titles), unit = "D")
+
+    anime = pd.DataFrame({
+        "anime_id": anime_ids,
+        "title": [" ".join(vocabulary[rng.integers(0, len(vocabulary), rng.integers(1, 5))]) + (" (TV)" if tv else "")
+                  for tv in rng.random(titles) < 0.3],
+        "studios": joined(rng, studios, titles, 2),
+        "genres": joined(rng, np.array(GENRES), titles, 5),
+        "completed_count": (rng.pareto(1.1, titles) * 100).astype(np.int64).clip(0, 2_000_000_000),
+        "start_date": np.where(rng.random(titles) < 0.05, "", start.strftime("%Y-%m-%d"))})
+    for score in range(1, 11):
+        anime[f"score_{score:02d}_count"] = (rng.pareto(1.3, titles) * 10 * score).astype(np.int64).clip(0, 2_000_000_000)
+
+    # Popular titles get most pairs (power law), as on MyAnimeList.
+    popular = np.minimum(rng.zipf(1.4, pairs * 2) - 1, titles - 1)
+    recomendations = pd.DataFrame({
+        "animeA": anime_ids[popular[:pairs]],
+        "animeB": anime_ids[rng.permutation(popular[pairs:])],
+        "num_recommenders": rng.zipf(2.0, pairs).clip(1, 10_000)})
+
+    anime_path = os.path.join(directory, "anime_info.csv")
+    recomendations_path = os.path.join(directory, "user_recomendations.csv")
+    anime.to_csv(anime_path, sep = "\t", index = False)
+    recomendations.to_csv(recomendations_path, sep = "\t", index = False)
+
+    return anime_path, recomendations_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Synthetic raw datasets, same schema as the MyAnimeList dump.")
+    parser.add_argument("directory")
+    parser.add_argument("--scale", type = float, default = 1)
+    parser.add_argument("--seed", type = int, default = 0)
+    args = parser.parse_args()
+
+    print(*generate(args.directory, args.scale, args.seed))
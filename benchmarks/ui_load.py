@@ -0,0 +1,529 @@
+import argparse
+import gc
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import yaml
+
+
+'''
+NOTE: Headless load test of the user interface. AnimeApp is launched under a virtual X display (Xvfb), against the
+local Jikan stub (stub_jikan.py), and scripted event sequences are replayed through real Tk events: combobox picks,
+search entries, right-clicks on result rows, SAVED and HOME. Double-clicks are dispatched to the results pane at the
+row coordinates (Tk refuses to generate Double events). For every scenario it reports:
+
+    latency      input to render: from the event to the first paint of its result (rows shown, title being typed).
+    max stall    longest the event loop did not run, sampled by a 5 ms after() probe.
+    growth       Tk widgets and images, Python objects and RSS, after against before.
+
+Run from the repository root (Xvfb must be installed, an existing $DISPLAY is used with --display):
+
+    python -m benchmarks.ui_load --save benchmarks/ui_baseline.json
+    python -m benchmarks.ui_load --compare benchmarks/ui_baseline.json
+
+The application runs in a temporary folder (config pointed at the stub, empty caches and favorites), the dataset and
+images of the repository are linked into it. Without data/anime_rec_processed.csv, synthetic pairs over the catalog are
+used.
+'''
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_xvfb(display:int = 99, screen:str = "1400x900x24", timeout:float = 10.0):
+    """
+    Starts a virtual X display and points DISPLAY at it.
+
+    Args:
+        display (int, optional): Display number.
+        screen (str, optional): Screen geometry and depth.
+        timeout (float, optional): Seconds to wait for the display socket.
+
+    Raises:
+        RuntimeError: if Xvfb is not installed or does not come up.
+
+    Returns:
+        subprocess.Popen: The Xvfb process, to terminate.
+    """
+    if shutil.which("Xvfb") is None:
+        raise RuntimeError("Xvfb not found. Install it (e.g. apt install xvfb), or use --display with a running X server.")
+
+    process = subprocess.Popen(["Xvfb", f":{display}", "-screen", "0", screen, "-nolisten", "tcp"], stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL)
+    socket = f"/tmp/.X11-unix/X{display}"
+    deadline = time.monotonic() + timeout
+
+    while not os.path.exists(socket):
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            raise RuntimeError(f"Xvfb did not start on :{display}.")
+        time.sleep(0.05)
+
+    os.environ["DISPLAY"] = f":{display}"
+    return process
+
+def prepare_workdir(directory:str, stub_url:str, rate:float, instant:bool, seed:int = 0):
+    """
+    Lays out a working folder the application can run from: a config pointed at the stub, with its caches, favorites
+    and refresh files inside the folder, and the dataset and images of the repository linked.
+
+    Args:
+        directory (str): The folder.
+        stub_url (str): Base URL of the Jikan stub.
+        rate (float): Jikan requests per second allowed.
+        instant (bool): Prints every typewriter text at once.
+        seed (int, optional): Seed of the synthetic recommendations, when the repository has none.
+    """
+    with open(os.path.join(ROOT, "config.yaml")) as file:
+        config = yaml.safe_load(file)
+
+    config["jikan"].update(base_url = stub_url, rate_per_second = rate, burst = max(int(rate), 2), cache_path = "jikan_cache.sqlite3")
+    config["covers"]["cache_dir"] = "covers_cache"
+    config["typewriter"]["instant"] = instant
+    config["refresh"] = {"state_path": "refresh_state.sqlite3", "anime_delta": "anime_info_delta.csv", "recomendations_delta": "anime_rec_delta.csv"}
+    config["perf"]["enabled"] = False
+
+    with open(os.path.join(directory, "config.yaml"), "w") as file:
+        yaml.safe_dump(config, file)
+
+    os.symlink(os.path.join(ROOT, "misc"), os.path.join(directory, "misc"))
+    os.makedirs(os.path.join(directory, "data"))
+
+    # Links, not copies: snapshots are written in the folder, next to the links.
+    for name in ("anime_info_processed.csv", "anime_rec_processed.csv"):
+        source = os.path.join(ROOT, "data", name)
+        if os.path.exists(source):
+            os.symlink(source, os.path.join(directory, "data", name))
+
+    recomendations = os.path.join(directory, "data", "anime_rec_processed.csv")
+    if not os.path.exists(recomendations):
+        synthetic_recomendations(os.path.join(ROOT, "data", "anime_info_processed.csv"), recomendations, seed = seed)
+
+def synthetic_recomendations(catalog:str, filepath:str, per_title:float = 4.5, seed:int = 0):
+    """
+    Writes processed recommendation pairs over the titles of a catalog, popular titles getting most of them.
+
+    Args:
+        catalog (str): Processed anime dataset.
+        filepath (str): The processed recommendations file written.
+        per_title (float, optional): Pairs per title.
+        seed (int, optional): Random seed.
+    """
+    from data.data_processing import exporter
+
+    rng = np.random.default_rng(seed)
+    ids = pd.read_csv(catalog, usecols = ["Anime_id", "Completed_count"]).sort_values("Completed_count", ascending = False)["Anime_id"].to_numpy()
+    pairs = int(len(ids) * per_title)
+    popular = np.minimum(rng.zipf(1.4, pairs * 2) - 1, len(ids) - 1)
+
+    exporter(pd.DataFrame({"Animea": ids[popular[:pairs]], "Animeb": ids[rng.permutation(popular[pairs:])],
+                           "Num_recommenders": rng.zipf(2.0, pairs).clip(1, 10_000)}), filepath)
+
+def rss_mb():
+    """
+    Returns:
+        float | None: Resident memory of the process, None where /proc is not available.
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return None
+
+
+class StallProbe:
+    """
+    after() callback rescheduled every interval while the harness lets the event loop run. A late run means the loop
+    was busy (a callback, a redraw): the delay is a stall.
+
+    Args:
+        root (tk.Tk): The application window.
+        interval (int, optional): Milliseconds between two samples.
+    """
+
+    def __init__(self, root, interval:int = 5):
+
+        # variables.
+        self.root = root
+        self.interval = interval / 1000
+        self.last = time.perf_counter()
+        self.max_stall = 0.0
+
+        self.root.after(interval, self.tick)
+
+    def tick(self):
+        now = time.perf_counter()
+        self.max_stall = max(self.max_stall, now - self.last - self.interval)
+        self.last = now
+        self.root.after(int(self.interval * 1000), self.tick)
+
+    def reset(self):
+        """
+        Returns:
+            float: Longest stall (seconds) since the last reset.
+        """
+        stall, self.max_stall = self.max_stall, 0.0
+        self.last = time.perf_counter() # time spent measuring by the harness is not a stall.
+        return stall
+
+
+class UIHarness:
+    """
+    Drives one AnimeApp through real Tk events and measures every step.
+
+    Args:
+        app (AnimeApp): The application, created in the working folder.
+        timeout (float, optional): Seconds a step may take to render before it is reported as timed out.
+    """
+
+    def __init__(self, app, timeout:float = 10.0):
+        import tkinter as tk
+        from tkinter import ttk
+
+        # variables.
+        self.app = app
+        self.timeout = timeout
+        self.latencies = []
+        self.timeouts = 0
+
+        app.update()
+        self.comboboxes = [w for w in self.widgets() if isinstance(w, ttk.Combobox)]
+        self.entry = app.state["search_entry"] # ttk.Combobox is an Entry too, the search box is not found by type.
+        self.buttons = {w.cget("text"): w for w in self.widgets() if isinstance(w, tk.Button)}
+        self.probe = StallProbe(app)
+
+    def widgets(self):
+        """
+        Returns:
+            list: Every widget of the window, at any depth.
+        """
+        found, stack = [], [self.app]
+        while stack:
+            children = stack.pop().winfo_children()
+            found.extend(children)
+            stack.extend(children)
+        return found
+
+    def counters(self):
+        return {"widgets": len(self.widgets()), "images": len(self.app.tk.call("image", "names")),
+                "objects": len(gc.get_objects()), "rss_mb": rss_mb()}
+
+    def settle(self, rendered:callable, begin:float = None):
+        """
+        Lets the event loop run until a step has rendered.
+
+        Args:
+            rendered (callable): True once the result of the step is on screen.
+            begin (float, optional): perf_counter of the input, now by default.
+
+        Returns:
+            float | None: Seconds since the input, None on timeout.
+        """
+        begin = begin or time.perf_counter()
+        while time.perf_counter() - begin < self.timeout:
+            self.app.update()
+            if rendered():
+                self.app.update_idletasks() # the pending redraw is part of the latency.
+                return time.perf_counter() - begin
+            time.sleep(0.001)
+        return None
+
+    def step(self, fire:callable, rendered:callable):
+        begin = time.perf_counter()
+        fire()
+        latency = self.settle(rendered, begin)
+
+        if latency is None:
+            self.timeouts += 1
+        else:
+            self.latencies.append(latency)
+
+    # Rendering conditions, built before the input.
+    def slot_typing(self, slot:tuple, text:str = ""):
+        """
+        Args:
+            slot (tuple): (x_loc, y_loc) of a typewriter text, e.g. (462, 388) for the status line.
+            text (str, optional): Text expected, compared without whitespace (typed texts are wrapped).
+
+        Returns:
+            callable: True once a new text holding it has started typing at that place.
+        """
+        slots = self.app.state["typewriter_slots"]
+        previous = slots[slot].typewriter if slot in slots else None
+        expected = "".join(text.split())
+
+        def rendered():
+            label = slots.get(slot)
+            return (label is not None and label.typewriter is not previous and expected in "".join("".join(label.typewriter.units).split())
+                    and label.get("1.0", "end").strip() != "")
+        return rendered
+
+    def status_typing(self):
+        # Every view types its status ("Sorted by:", "Similar to:", "What did you mean?", "... has been favorited.").
+        return self.slot_typing((462, 388))
+
+    def favorites_shown(self):
+        """
+        Returns:
+            callable: True once the results pane has loaded the favorites view, or the status line reports that there
+            are none.
+        """
+        if not len(self.app.get_state("favorites")):
+            return self.status_typing()
+
+        pane = self.app.state["results_pane"]
+        previous = pane.tree.data
+
+        return lambda: pane.winfo_ismapped() and pane.tree.data is not previous and list(pane.tree.data.columns) == ["Favorites"]
+
+    # Scripted inputs.
+    def pick(self, box:int, value:str):
+        combobox = self.comboboxes[box]
+        def fire():
+            combobox.set(value)
+            combobox.event_generate("<<ComboboxSelected>>")
+        self.step(fire, self.status_typing())
+
+    def search(self, text:str):
+        self.entry.focus_force()
+        self.app.update()
+        def fire():
+            self.entry.delete(0, "end")
+            self.entry.insert(0, text)
+            self.entry.event_generate("<Return>")
+        self.step(fire, self.status_typing())
+
+    def click_row(self, row:int, button:str):
+        """
+        Args:
+            row (int): Position of the row in the current view.
+            button (str): "<Double-1>" or "<Button-3>".
+
+        Returns:
+            str | None: The value of the row, None if the view has no such row.
+        """
+        import tkinter as tk
+
+        pane = self.app.state["results_pane"]
+        tree = pane.tree
+        self.app.update_idletasks()
+        box = tree.bbox(str(row)) if tree.exists(str(row)) else ""
+
+        if not box:
+            return None
+
+        value = tree.value(str(row))
+        x, y = box[0] + 5, box[1] + box[3] // 2
+
+        # A title opened has its name typed where the boot sequence was, a favorite is reported on the status line.
+        if button == "<Double-1>":
+            event = tk.Event()
+            event.x, event.y = x, y
+            self.step(lambda: pane.dispatch("double_click", event), self.slot_typing((27, 29), str(value)))
+        else:
+            self.step(lambda: tree.event_generate(button, x = x, y = y), self.status_typing())
+
+        return value
+
+    def press(self, text:str):
+        pane = self.app.state["results_pane"]
+        rendered = (lambda: not pane.winfo_ismapped()) if text == "HOME" else self.favorites_shown()
+        self.step(self.buttons[text].invoke, rendered)
+
+    def run(self, name:str, script:callable):
+        """
+        Replays a scenario and measures it.
+
+        Args:
+            name (str): The scenario name.
+            script (callable): Called with the harness, fires the steps.
+
+        Returns:
+            dict: Steps, timeouts, latency percentiles and max (ms), max stall (ms), growth of the counters.
+        """
+        self.latencies, self.timeouts = [], 0
+        before = self.counters()
+        self.probe.reset()
+        begin = time.perf_counter()
+
+        script(self)
+        self.settle(lambda: True)
+
+        stall = self.probe.reset()
+        after = self.counters()
+        latencies = np.array(self.latencies) * 1000
+
+        result = {"steps": len(self.latencies) + self.timeouts, "timeouts": self.timeouts, "elapsed_s": round(time.perf_counter() - begin, 3),
+                  **{f"latency_{key}_ms": round(float(value), 3) for key, value in
+                     zip(("p50", "p95", "max"), (*np.percentile(latencies, (50, 95)), latencies.max()) if len(latencies) else (np.nan,) * 3)},
+                  "max_stall_ms": round(stall * 1000, 3),
+                  **{f"{key}_growth": None if before[key] is None else round(after[key] - before[key], 3) for key in before},
+                  "widgets": after["widgets"]}
+
+        print(f"  {name:<10} {result['steps']:>4} steps  p50 {result['latency_p50_ms']:>8.1f} ms  p95 {result['latency_p95_ms']:>8.1f} ms  "
+              f"stall {result['max_stall_ms']:>8.1f} ms  widgets {result['widgets_growth']:+d}  timeouts {result['timeouts']}", file = sys.stderr)
+        return result
+
+
+def scenarios(config:dict, titles:list, rounds:int = 3):
+    """
+    Args:
+        config (dict): The application config (genres and studios offered).
+        titles (list): Titles of the catalog, sampled for the searches.
+        rounds (int, optional): Times every scenario repeats its script, growth shows up over repetitions.
+
+    Returns:
+        dict: name -> script.
+    """
+    genres, studios = config["genres"], config["studios"]
+
+    def browse(harness):
+        for _ in range(rounds):
+            for genre in genres:
+                harness.pick(0, genre)
+            for studio in studios:
+                harness.pick(1, studio)
+
+    def similar(harness):
+        for i in range(rounds):
+            harness.pick(0, genres[i % len(genres)])
+            for row in range(5):
+                harness.click_row(row, "<Double-1>")
+            harness.press("HOME")
+
+    def search(harness):
+        for title in titles[:rounds * 5]:
+            harness.search(title)
+            harness.search(title[:len(title) // 2] + title[len(title) // 2 + 1:]) # one character dropped: did you mean.
+
+    def favorites(harness):
+        for i in range(rounds):
+            harness.pick(1, studios[i % len(studios)])
+            for row in range(10):
+                harness.click_row(row, "<Button-3>")
+            harness.press("SAVED")
+            harness.press("HOME")
+
+    def session(harness):
+        for i in range(rounds):
+            harness.pick(0, genres[i % len(genres)])
+            harness.click_row(0, "<Double-1>")
+            harness.click_row(1, "<Button-3>")
+            harness.search(titles[i])
+            harness.click_row(0, "<Double-1>")
+            harness.press("SAVED")
+            harness.press("HOME")
+
+    return {"browse": browse, "similar": similar, "search": search, "favorites": favorites, "session": session}
+
+def compare(results:dict, baseline:dict, tolerance:float = 0.25, floor:float = 5.0):
+    """
+    Args:
+        results (dict): scenario -> measures of this run.
+        baseline (dict): The same, from a saved run.
+        tolerance (float, optional): Relative increase reported as a regression.
+        floor (float, optional): Milliseconds under which latencies and stalls are too noisy to compare.
+
+    Returns:
+        list: One line per regression.
+    """
+    regressions = []
+
+    for name, measures in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+
+        for key in ("latency_p50_ms", "latency_p95_ms", "max_stall_ms"):
+            if max(before[key], measures[key]) >= floor and measures[key] > before[key] * (1 + tolerance):
+                regressions.append(f"{name} {key}: {before[key]} -> {measures[key]}")
+        for key in ("widgets_growth", "images_growth"):
+            if measures[key] > max(before[key], 0):
+                regressions.append(f"{name} {key}: {before[key]} -> {measures[key]}")
+
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Headless UI load test: event loop responsiveness per scripted scenario.")
+    parser.add_argument("--scenarios", nargs = "+", default = None, help = "browse, similar, search, favorites, session (all by default).")
+    parser.add_argument("--rounds", type = int, default = 3)
+    parser.add_argument("--latency", type = float, default = 0.05, help = "seconds the stub adds to every response.")
+    parser.add_argument("--jikan-rate", type = float, default = 20.0, help = "Jikan requests per second allowed against the stub.")
+    parser.add_argument("--instant", action = "store_true", help = "typewriter texts printed at once.")
+    parser.add_argument("--display", action = "store_true", help = "use $DISPLAY instead of starting Xvfb.")
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--save", help = "write the report to a JSON baseline.")
+    parser.add_argument("--compare", help = "JSON baseline to compare the report with.")
+    parser.add_argument("--tolerance", type = float, default = 0.25)
+    args = parser.parse_args()
+
+    save = args.save and os.path.abspath(args.save)
+    baseline = args.compare and os.path.abspath(args.compare)
+    home = os.getcwd()
+    xvfb = None if args.display else start_xvfb()
+    directory = tempfile.mkdtemp(prefix = "ui_load_")
+
+    import stub_jikan
+
+    stub = stub_jikan.make_server(port = 0, latency = args.latency,
+                                  catalog = os.path.join(ROOT, "data", "anime_info_processed.csv"),
+                                  image = os.path.join(ROOT, "misc", "kav_effect_resized.png"),
+                                  recomendations = os.path.join(ROOT, "data", "anime_rec_processed.csv"))
+    threading.Thread(target = stub.serve_forever, daemon = True).start()
+
+    try:
+        prepare_workdir(directory, f"http://127.0.0.1:{stub.server_port}/v4", args.jikan_rate, args.instant, seed = args.seed)
+        os.chdir(directory) # the application reads config.yaml, data/ and misc/ from the current folder.
+
+        with open("config.yaml") as file:
+            config = yaml.safe_load(file)
+
+        rng = np.random.default_rng(args.seed)
+        titles = [title for title in pd.read_csv(os.path.join("data", "anime_info_processed.csv"), usecols = ["Title"])["Title"].dropna().str.strip() if title]
+        titles = [titles[i] for i in rng.permutation(len(titles))]
+
+        from app import AnimeApp
+
+        begin = time.perf_counter()
+        app = AnimeApp()
+        harness = UIHarness(app)
+        startup = time.perf_counter() - begin
+
+        results = {}
+        for name, script in scenarios(config, titles, rounds = args.rounds).items():
+            if args.scenarios is None or name in args.scenarios:
+                results[name] = harness.run(name, script)
+
+        report = {"startup_s": round(startup, 3), "stub_requests": stub.requests, "rounds": args.rounds, "latency": args.latency,
+                  "instant": args.instant, "created_at": time.time(), "results": results}
+
+        if "favorites" in app.state:
+            app.state["favorites"].close()
+        app.destroy()
+    finally:
+        os.chdir(home)
+        stub.shutdown()
+        shutil.rmtree(directory, ignore_errors = True)
+        if xvfb is not None:
+            xvfb.terminate()
+
+    if save:
+        with open(save, "w") as file:
+            json.dump(report, file, indent = 2)
+
+    if baseline:
+        with open(baseline) as file:
+            regressions = compare(results, json.load(file)["results"], tolerance = args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file = sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+    if not save:
+        print(json.dumps(report, indent = 2))
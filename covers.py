@@ -0,0 +1,146 @@
+import hashlib
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+
+class CoverCache:
+    """
+    Loads cover art on worker threads. Images are downloaded once, decoded and resized off the Tk thread, and kept as
+    thumbnails in an on-disk cache capped in bytes (oldest used are deleted first). Only the final PhotoImage creation
+    is left to the caller, on the Tk thread.
+
+    Args:
+        directory (str): The thumbnail folder.
+        max_bytes (int): Byte budget of the folder.
+        workers (int, optional): Download/decode threads.
+    """
+
+    def __init__(self, directory:str, max_bytes:int, workers:int = 2):
+
+        # variables.
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.executor = ThreadPoolExecutor(max_workers = workers, thread_name_prefix = "covers")
+        self.pending = {}
+        self.lock = threading.RLock()
+        self.session = None
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(directory, exist_ok = True)
+
+    def path(self, url:str, size:tuple):
+        """
+        Args:
+            url (str): The cover URL.
+            size (tuple): Thumbnail (width, height).
+
+        Returns:
+            str: The thumbnail file, addressed by the hash of URL and size.
+        """
+        key = hashlib.sha1(f"{url}|{size[0]}x{size[1]}".encode()).hexdigest()
+        return os.path.join(self.directory, f"{key}.jpg")
+
+    def submit(self, url:str, size:tuple):
+        """
+        Schedules a cover. Identical in-flight requests share one Future.
+
+        Args:
+            url (str): The cover URL.
+            size (tuple): Thumbnail (width, height).
+
+        Returns:
+            Future: Resolves to the resized PIL image.
+        """
+        key = (url, tuple(size))
+
+        with self.lock:
+            if key not in self.pending:
+                future = self.executor.submit(self.load, url, tuple(size))
+                self.pending[key] = future
+                future.add_done_callback(lambda _: self.forget(key)) # may run right away, hence the RLock.
+                return future
+            return self.pending[key]
+
+    def forget(self, key:tuple):
+        with self.lock:
+            self.pending.pop(key, None)
+
+    def load(self, url:str, size:tuple):
+        """
+        Returns a thumbnail from the disk cache, downloading, resizing and storing it on a miss. Runs on a worker.
+
+        Args:
+            url (str): The cover URL.
+            size (tuple): Thumbnail (width, height).
+
+        Raises:
+            requests.exceptions.RequestException: if an ambiguous exception happens while handling the request.
+            UnidentifiedImageError: if an image cannot be opened and identified.
+            OSError: for I/O related errors.
+
+        Returns:
+            PIL.Image: The thumbnail, fully decoded.
+        """
+        path = self.path(url, size)
+
+        if os.path.exists(path):
+            os.utime(path) # most recently used.
+            with Image.open(path) as image:
+                image.load()
+            with self.lock:
+                self.hits += 1
+            return image
+
+        with self.lock:
+            self.misses += 1
+
+        import requests
+
+        if self.session is None:
+            self.session = requests.Session()
+
+        response = self.session.get(url, timeout = 30)
+        response.raise_for_status()
+
+        with Image.open(io.BytesIO(response.content)) as image:
+            thumbnail = image.convert("RGB").resize(size = size)
+
+        temporary = f"{path}.{threading.get_ident()}.tmp"
+        thumbnail.save(temporary, format = "JPEG", quality = 90)
+        os.replace(temporary, path)
+        self.evict()
+
+        return thumbnail
+
+    def stats(self):
+        """
+        Returns:
+            dict: Hit/miss counters of the thumbnail folder.
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def evict(self):
+        """
+        Deletes least recently used thumbnails while the folder exceeds its byte budget.
+        """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".jpg"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
@@ -1,9 +1,22 @@
 import pandas as pd
 import numpy as np
+import json
 import os
 
 # settings.
 pd.set_option('display.max_rows', None)
+
+# Rows parsed per chunk, peak memory of the recommendations pipeline is bounded by it.
+CHUNKSIZE = 500_000
+
+# Columns parsed from the raw files, with compact dtypes. Anything else is skipped while parsing. Counts may be blank
+# in a dump, hence the nullable "Int32".
+ANIME_COLUMNS = {"title": object, "studios": "category", "genres": object, "completed_count": "Int32",
+                 "start_date": object, "anime_id": np.int32, **{f"score_{i:02d}_count": "Int32" for i in range(2, 11)}}
+RECOMENDATION_COLUMNS = {"animeA": np.int32, "animeB": np.int32, "num_recommenders": np.float32} # NaN before fillna.
+
+# Layout of the binary snapshots, older snapshots are rebuilt from their CSV.
+SNAPSHOT_VERSION = 2
 '''
 NOTE: The aplication will look for matching strings to iterate AFTER the first aplication window.
 
@@ -37,6 +50,29 @@ def load_data(filepath, sep=None):
         return pd.read_csv(filepath)
     except Exception as e:
         raise RecursionError(f"Failed to load data. {filepath}")
+
+def read_chunks(filepath, sep=None, dtype=None, chunksize=CHUNKSIZE):
+
+    '''
+    Iterates over a CSV file in typed chunks. Only the columns listed in dtype are parsed.
+
+    Args:
+        filepath (str): Path to the dataset.
+        sep (str, optional): Column separator.
+        dtype (dict, optional): Column -> dtype, e.g. ANIME_COLUMNS.
+        chunksize (int, optional): Rows per chunk.
+
+    Returns:
+        Iterator[pd.DataFrame]: The chunks.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    '''
+
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"File not found {filepath}")
+
+    return pd.read_csv(filepath, sep = sep or ",", usecols = list(dtype) if dtype else None, dtype = dtype, chunksize = chunksize)
         
 
 def anime_processor(df):
@@ -51,10 +87,23 @@ def anime_processor(df):
         data = pd.DataFrame()
     """
     
-    data = df.copy()
+    return rank_anime(anime_chunk_processor(df))
+
+def anime_chunk_processor(df):
+
+    """
+    Row-wise part of anime_processor, so that it can run on chunks. "Rank" holds the score ratio, to be ranked
+    over every row by rank_anime.
+
+    Args:
+        df = pd.DataFrame()
+
+    Returns:
+        data = pd.DataFrame()
+    """
     
-    # matching iterable.
-    data.rename({"score_10_count": "score_010_count"}, axis = 1, inplace = True)
+    # matching iterable (rename returns a new frame, the chunk is not copied twice).
+    data = df.rename({"score_10_count": "score_010_count"}, axis = 1)
 
     scores = np.flip(np.arange(2, 11))
 
@@ -70,30 +119,40 @@ def anime_processor(df):
         if 1 < i < 5: 
             low.append(f"score_0{i}_count")
 
-    # value assignment.
-    data['scores_good'] = data.loc[:,high].sum(axis=1)
-    data["scores_medium"] = data.loc[:,medium].sum(axis=1)
-    data["scores_low"] = data.loc[:,low].sum(axis=1)
+    # value assignment (int64 sums, int32 counts would overflow on a full dump). Blank counts add nothing.
+    scores_good = data.loc[:,high].fillna(0).astype(np.int64).sum(axis=1)
+    scores_medium = data.loc[:,medium].fillna(0).astype(np.int64).sum(axis=1)
+    scores_low = data.loc[:,low].fillna(0).astype(np.int64).sum(axis=1)
+
+    # Avoiding convergence before filling NaN's.
+    year = pd.to_datetime(data["start_date"]).dt.year.fillna(0).astype(np.int16)
 
     # columns creation.
-    data["rank"] = (data["scores_low"] / data["scores_medium"]  / data["scores_good"]).rank()
-    data.fillna({"rank": 0}, inplace = True)
-    data["rank"] = data["rank"].astype(int)
+    data = pd.DataFrame({
+        "Title": data["title"].str.replace(r"\(TV\)", "", regex = True),
+        "Studios": data["studios"],
+        "Genres": data["genres"],
+        "Rank": scores_low / scores_medium / scores_good,
+        "Completed_count": data["completed_count"],
+        "Year": year,
+        "Anime_id": data["anime_id"]})
+    
+    return data
 
+def rank_anime(data):
 
-    data["start_date"] = pd.to_datetime(data["start_date"]).dt.year
-    data.rename(columns={'start_date': 'year'}, inplace = True)
-    data.fillna({'year': 0}, inplace = True)
+    """
+    Turns the score ratio of anime_chunk_processor into the rank, over every row. Updates the DataFrame in place.
 
-    # Avoiding convergence before filling NaN's.
-    data["year"] = data["year"].astype(int)
+    Args:
+        data = pd.DataFrame()
 
-    data = data[['title','studios', 'genres', 'rank', 'completed_count', 'year', 'anime_id']]
+    Returns:
+        data = pd.DataFrame()
+    """
+
+    data["Rank"] = data["Rank"].rank().fillna(0).astype(np.int32)
 
-    data["title"] = data["title"].str.replace(r"\(TV\)", "", regex = True)
-    
-    data.columns = data.columns.str.capitalize()
-    
     return data
 
 def recomendation_processor(df):
@@ -107,11 +166,9 @@ def recomendation_processor(df):
         data = pd.DataFrame()
     """
     
-    data = df.copy()
-    
-    data = data[["animeA", "animeB", "num_recommenders"]]
+    data = df[["animeA", "animeB", "num_recommenders"]]
 
-    data.fillna({'num_recommenders': 0}, inplace = True)
+    data = data.fillna({'num_recommenders': 0}).astype({"num_recommenders": np.int32})
 
     data.columns = data.columns.str.capitalize()
 
@@ -128,16 +185,301 @@ def exporter(df, name):
         NONE
 
     """
-    data = df.copy()
-    data.to_csv(name)
+    df.to_csv(name)
+
+def chunked_exporter(chunks, name):
+    """
+    Exports chunks to one CSV file as they come, the same file exporter writes for the whole DataFrame (the index
+    keeps counting across chunks). Written aside and renamed at the end, an interrupted run leaves no partial file.
+
+    Args:
+        chunks = Iterable[pd.DataFrame]
+        name = name to export.
+    Return:
+        rows = number of rows written.
+
+    """
+    rows = 0
+    temporary = f"{name}.tmp"
+
+    with open(temporary, "w", newline = "") as file:
+        for i, chunk in enumerate(chunks):
+            chunk.index = pd.RangeIndex(rows, rows + len(chunk))
+            chunk.to_csv(file, header = i == 0)
+            rows += len(chunk)
+
+    os.replace(temporary, name)
+    return rows
+
+def snapshot_exporter(df, name, source=None, categorical=("Studios", "Genres")):
+    """
+    Exports a typed binary snapshot to folder: one memory-mappable .npy file per column, plus a meta.json. Delimited
+    columns are dictionary-encoded (int32 codes + categories), integer columns are downcast, strings are stored as
+    UTF-8 bytes (see write_strings).
+
+    Args:
+        df = pd.DataFrame()
+        name = folder to export.
+        source = file the snapshot was made from (its size and mtime are recorded to detect staleness).
+        categorical = columns to be dictionary-encoded.
+    Return:
+        NONE
+
+    """
+    os.makedirs(name, exist_ok = True)
+    meta = {"version": SNAPSHOT_VERSION, "columns": [], "source": None}
+
+    for i, column in enumerate(df.columns):
+        # file names by position, column names such as "Unnamed: 0" are not valid on every OS.
+        entry = {"name": column, "file": f"col{i}.npy"}
+        values = df[column]
+
+        if column in categorical:
+            codes, categories = pd.factorize(values) # missing values are coded -1.
+            write_strings(name, f"col{i}.categories.npy", categories)
+            values = codes.astype(np.int32)
+            entry["kind"] = "category"
+        elif not pd.api.types.is_numeric_dtype(values): # object, or the string dtype of pandas 3.
+            write_strings(name, entry["file"], values)
+            entry["kind"] = "string"
+            meta["columns"].append(entry)
+            continue
+        elif pd.api.types.is_integer_dtype(values):
+            values = pd.to_numeric(values, downcast = "integer").to_numpy()
+            entry["kind"] = "numeric"
+        else:
+            values = values.to_numpy()
+            entry["kind"] = "numeric"
 
-def main():
-    anime_info = load_data("anime_info.csv", "\t")
-    anime_rec = load_data("user_recomendations.csv", "\t")
-    anime_info_processed = anime_processor(anime_info)
-    anime_rec_processed = recomendation_processor(anime_rec)
+        np.save(os.path.join(name, entry["file"]), values)
+        meta["columns"].append(entry)
+
+    write_meta(name, meta, source)
+
+def chunked_snapshot_exporter(filepath, name, rows, chunksize=CHUNKSIZE):
+    """
+    Exports the snapshot of a large, all numeric CSV file (such as the processed recommendations) chunk by chunk:
+    columns are preallocated as .npy memory maps and filled as the file is read back, so the whole table is never in
+    memory. Same layout as snapshot_exporter.
+
+    Args:
+        filepath = CSV file written by exporter or chunked_exporter.
+        name = folder to export.
+        rows = number of rows of the file.
+        chunksize = rows per chunk.
+    Return:
+        NONE
+
+    Raises:
+        ValueError: if a column is not numeric.
+
+    """
+    os.makedirs(name, exist_ok = True)
+    meta = {"version": SNAPSHOT_VERSION, "columns": [], "source": None}
+    arrays = []
+    offset = 0
+
+    for chunk in pd.read_csv(filepath, chunksize = chunksize):
+        if not arrays:
+            for i, column in enumerate(chunk.columns):
+                if not pd.api.types.is_numeric_dtype(chunk[column]):
+                    raise ValueError(f"Column is not numeric: {column}")
+                
+                dtype = np.int32 if pd.api.types.is_integer_dtype(chunk[column]) else np.float64
+                arrays.append(np.lib.format.open_memmap(os.path.join(name, f"col{i}.npy"), mode = "w+", dtype = dtype, shape = (rows,)))
+                meta["columns"].append({"name": column, "file": f"col{i}.npy", "kind": "numeric"})
+
+        for array, column in zip(arrays, chunk.columns):
+            array[offset:offset + len(chunk)] = chunk[column].to_numpy()
+        offset += len(chunk)
+
+    for array in arrays:
+        array.flush()
+
+    write_meta(name, meta, filepath)
+
+def write_strings(name, file, values):
+    """
+    Writes a string column as its UTF-8 bytes, concatenated (file), the int64 byte offsets of every value
+    (file.offsets.npy, one more than the values) and the positions of the missing ones (file.missing.npy). Fixed width
+    numpy strings would take 4 bytes per character of the longest value.
+
+    Args:
+        name = snapshot folder.
+        file = file name of the bytes.
+        values = strings, missing values as NaN/None.
+    Return:
+        NONE
+
+    """
+    values = pd.Series(values, copy = False)
+    missing = values.isna().to_numpy()
+    encoded = [value.encode("utf-8") for value in values.astype(object).where(~missing, "").astype(str)]
+
+    offsets = np.zeros(len(encoded) + 1, dtype = np.int64)
+    np.cumsum([len(value) for value in encoded], out = offsets[1:])
+
+    np.save(os.path.join(name, file), np.frombuffer(b"".join(encoded), dtype = np.uint8))
+    np.save(os.path.join(name, file.replace(".npy", ".offsets.npy")), offsets)
+    np.save(os.path.join(name, file.replace(".npy", ".missing.npy")), np.flatnonzero(missing))
+
+def read_strings(name, file):
+    """
+    Reads a string column written by write_strings. The bytes are memory-mapped and decoded in one pass, without an
+    intermediate fixed width copy.
+
+    Args:
+        name = snapshot folder.
+        file = file name of the bytes.
+    Returns:
+        np.ndarray: object array of str, None where missing.
+    """
+    data = np.load(os.path.join(name, file), mmap_mode = "r")
+    offsets = np.load(os.path.join(name, file.replace(".npy", ".offsets.npy")))
+    missing = np.load(os.path.join(name, file.replace(".npy", ".missing.npy")))
+
+    # Decoded at once, byte offsets become character offsets by discounting the UTF-8 continuation bytes before them.
+    text = str(memoryview(data), "utf-8")
+    if len(text) != len(data):
+        continuations = np.flatnonzero((data & 0xC0) == 0x80)
+        offsets = offsets - np.searchsorted(continuations, offsets)
+    offsets = offsets.tolist()
+
+    values = np.empty(len(offsets) - 1, dtype = object)
+    values[:] = [text[start:stop] for start, stop in zip(offsets[:-1], offsets[1:])]
+    values[missing] = None
+
+    return values
+
+def write_meta(name, meta, source=None):
+    """
+    Writes the meta.json of a snapshot, atomically.
+
+    Args:
+        name = snapshot folder.
+        meta = column entries, see snapshot_exporter.
+        source = file the snapshot was made from (its size and mtime are recorded to detect staleness).
+    Return:
+        NONE
+
+    """
+    if source is not None:
+        stat = os.stat(source)
+        meta["source"] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    # meta.json is written last, a half written snapshot is never picked up.
+    with open(os.path.join(name, "meta.json.tmp"), "w") as file:
+        json.dump(meta, file)
+    os.replace(os.path.join(name, "meta.json.tmp"), os.path.join(name, "meta.json"))
+
+def load_snapshot(name, source=None):
+    """
+    Loads a binary snapshot made by snapshot_exporter. Numeric columns and codes are memory-mapped.
+
+    Args:
+        name = snapshot folder.
+        source = file the snapshot was made from. If it changed since (size or mtime), the snapshot is stale.
+    Returns:
+        pd.DataFrame() | None: None if the snapshot is missing or stale.
+    """
+    meta_path = os.path.join(name, "meta.json")
+
+    if not os.path.exists(meta_path):
+        return None
+
+    with open(meta_path) as file:
+        meta = json.load(file)
+
+    if meta.get("version") != SNAPSHOT_VERSION:
+        return None
+
+    if source is not None and meta["source"] is not None and os.path.exists(source):
+        stat = os.stat(source)
+        if stat.st_size != meta["source"]["size"] or stat.st_mtime_ns > meta["source"]["mtime_ns"]:
+            return None
+
+    columns = {}
+    for entry in meta["columns"]:
+        if entry["kind"] == "string":
+            columns[entry["name"]] = read_strings(name, entry["file"])
+            continue
+
+        values = np.load(os.path.join(name, entry["file"]), mmap_mode = "r")
+
+        if entry["kind"] == "category":
+            categories = read_strings(name, entry["file"].replace(".npy", ".categories.npy"))
+            values = pd.Categorical.from_codes(values, categories)
+
+        columns[entry["name"]] = values
+
+    return pd.DataFrame(columns, copy = False)
+
+def merge_anime_delta(data, delta):
+    """
+    Merges the titles refreshed by refresh.py over the processed dataset. The last version of every refreshed title
+    replaces its row, new titles are appended. Rows that were not refreshed keep their order.
+
+    Args:
+        data = pd.DataFrame() of the processed dataset.
+        delta = pd.DataFrame() of the delta file (processed columns plus "Sync").
+    Return:
+        data = pd.DataFrame()
+
+    """
+    delta = delta.drop_duplicates("Anime_id", keep = "last")
+    refreshed = data["Anime_id"].isin(delta["Anime_id"])
+
+    # Rank is a rank over the whole catalog, refreshed titles keep theirs.
+    ranks = pd.Series(data["Rank"].to_numpy(), index = data["Anime_id"].to_numpy())
+    ranks = ranks[~ranks.index.duplicated()]
+    delta = delta.drop(columns = "Sync").assign(Rank = delta["Anime_id"].map(ranks).fillna(0).astype(int))
+
+    if "Unnamed: 0" in data.columns:
+        delta.insert(0, "Unnamed: 0", np.arange(len(data), len(data) + len(delta)))
+
+    return pd.concat([data[~refreshed], delta[data.columns]], ignore_index = True)
+
+def merge_recomendation_delta(data, delta, anime_delta):
+    """
+    Merges the recommendation pairs refreshed by refresh.py. A refreshed title brings every pair it is part of, so its
+    old pairs, in both directions, are replaced by the ones of its last sync.
+
+    Args:
+        data = pd.DataFrame() of the processed recommendations.
+        delta = pd.DataFrame() of the recommendations delta file.
+        anime_delta = pd.DataFrame() of the anime delta file (the sync of every refreshed title).
+    Return:
+        data = pd.DataFrame()
+
+    """
+    latest = anime_delta.drop_duplicates("Anime_id", keep = "last").set_index("Anime_id")["Sync"]
+    delta = delta[delta["Animea"].map(latest) == delta["Sync"]]
+
+    pairs = delta[["Animea", "Animeb", "Num_recommenders"]]
+    pairs = pd.concat([pairs, pairs.rename(columns = {"Animea": "Animeb", "Animeb": "Animea"})], ignore_index = True)
+    pairs = pairs.drop_duplicates(["Animea", "Animeb"], keep = "last")
+
+    kept = data[~(data["Animea"].isin(latest.index) | data["Animeb"].isin(latest.index))]
+
+    if "Unnamed: 0" in data.columns:
+        pairs.insert(0, "Unnamed: 0", np.arange(len(data), len(data) + len(pairs)))
+
+    return pd.concat([kept, pairs[data.columns]], ignore_index = True)
+
+def main(chunksize=CHUNKSIZE):
+    # One row per title: the processed chunks are kept, the rank needs every row.
+    anime_info = read_chunks("anime_info.csv", "\t", ANIME_COLUMNS, chunksize)
+    anime_info_processed = pd.concat([anime_chunk_processor(chunk) for chunk in anime_info], ignore_index = True)
+    anime_info_processed = rank_anime(anime_info_processed)
     exporter(anime_info_processed, "anime_info_processed.csv")
-    exporter(anime_rec_processed, "anime_rec_processed.csv")
+
+    # Recommendations are streamed, written as they are processed.
+    anime_rec = read_chunks("user_recomendations.csv", "\t", RECOMENDATION_COLUMNS, chunksize)
+    rows = chunked_exporter((recomendation_processor(chunk) for chunk in anime_rec), "anime_rec_processed.csv")
+
+    # snapshots hold exactly what the application would parse from the exported CSV files.
+    snapshot_exporter(load_data("anime_info_processed.csv"), "anime_info_processed.snapshot", source = "anime_info_processed.csv")
+    chunked_snapshot_exporter("anime_rec_processed.csv", "anime_rec_processed.snapshot", rows, chunksize)
 
 if __name__ == "__main__":
     main()
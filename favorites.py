@@ -0,0 +1,168 @@
+import csv
+import json
+import os
+import threading
+
+
+class FavoritesStore:
+    """
+    The user favorites. Kept in memory as an ordered set (a dict), loaded once, so checking, adding and removing a
+    title are O(1). Changes are appended to a log, one JSON record per line, and fsync'ed in batches by a background
+    thread. The log is compacted in the background once it holds many more records than titles.
+
+    Args:
+        path (str): The log file.
+        legacy (str, optional): CSV file of older versions (one "Title" column), imported when the log does not exist.
+        sync_interval (float, optional): Seconds between two fsyncs of pending changes.
+        compact_ratio (float, optional): Log records per title above which the log is compacted.
+    """
+
+    def __init__(self, path:str, legacy:str = None, sync_interval:float = 1.0, compact_ratio:float = 2.0):
+
+        # variables.
+        self.path = path
+        self.sync_interval = sync_interval
+        self.compact_ratio = compact_ratio
+        self.titles = {}
+        self.records = 0
+        self.dirty = False
+        self.lock = threading.Lock()
+        self.closed = threading.Event()
+
+        if os.path.exists(path):
+            self.replay()
+        elif legacy is not None and os.path.exists(legacy):
+            with open(legacy, newline = "", encoding = "utf-8") as file:
+                rows = [row[0] for row in csv.reader(file) if row]
+            self.titles = dict.fromkeys(rows[1:]) # header skipped.
+            self.compact()
+        else:
+            self.compact()
+
+        self.file = self.open_log()
+        self.syncer = threading.Thread(target = self.sync_loop, daemon = True)
+        self.syncer.start()
+
+    def replay(self):
+        """
+        Rebuilds the set from the log. A torn last line (crash while appending) is ignored.
+        """
+        with open(self.path, encoding = "utf-8") as file:
+            for line in file:
+                try:
+                    operation, title = json.loads(line)
+                except ValueError:
+                    continue
+
+                if operation == "+":
+                    self.titles[title] = None
+                elif operation == "-":
+                    self.titles.pop(title, None)
+                self.records += 1
+
+    def __contains__(self, title:str):
+        return title in self.titles
+
+    def __len__(self):
+        return len(self.titles)
+
+    def __iter__(self):
+        return iter(list(self.titles))
+
+    def add(self, title:str):
+        """
+        Args:
+            title (str): The title.
+
+        Returns:
+            bool: False if it already was a favorite.
+        """
+        with self.lock:
+            if title in self.titles:
+                return False
+            self.titles[title] = None
+            self.append("+", title)
+        return True
+
+    def remove(self, title:str):
+        """
+        Args:
+            title (str): The title.
+
+        Returns:
+            bool: False if it was not a favorite.
+        """
+        with self.lock:
+            if title not in self.titles:
+                return False
+            del self.titles[title]
+            self.append("-", title)
+        return True
+
+    def clear(self):
+        with self.lock:
+            self.titles = {}
+            self.file.close()
+            self.compact()
+            self.file = self.open_log()
+
+    def open_log(self):
+        with open(self.path, "rb") as file:
+            size = file.seek(0, os.SEEK_END)
+            file.seek(max(size - 1, 0))
+            torn = size > 0 and file.read(1) != b"\n"
+
+        file = open(self.path, "a", encoding = "utf-8")
+
+        # A torn last line is terminated, so that the next record does not get glued to it.
+        if torn:
+            file.write("\n")
+        return file
+
+    def append(self, operation:str, title:str):
+        # Handed to the OS right away (survives the process), fsync'ed later by the background thread.
+        self.file.write(json.dumps([operation, title]) + "\n")
+        self.file.flush()
+        self.records += 1
+        self.dirty = True
+
+    def compact(self):
+        """
+        Rewrites the log with one record per title, atomically. Called with the lock held (or before the log is open).
+        """
+        temporary = f"{self.path}.tmp"
+
+        with open(temporary, "w", encoding = "utf-8") as file:
+            for title in self.titles:
+                file.write(json.dumps(["+", title]) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temporary, self.path)
+        self.records = len(self.titles)
+        self.dirty = False
+
+    def sync(self):
+        """
+        Makes the pending changes durable, compacting the log instead when it has grown too large.
+        """
+        with self.lock:
+            if self.records > self.compact_ratio * len(self.titles) + 64:
+                self.file.close()
+                self.compact()
+                self.file = self.open_log()
+            elif self.dirty:
+                os.fsync(self.file.fileno())
+                self.dirty = False
+
+    def sync_loop(self):
+        while not self.closed.wait(self.sync_interval):
+            self.sync()
+
+    def close(self):
+        if self.closed.is_set():
+            return
+        self.closed.set()
+        self.sync()
+        with self.lock:
+            self.file.close()
@@ -0,0 +1,167 @@
+import heapq
+from array import array
+from collections import defaultdict
+from indexes import normalize_title
+
+
+def ngrams(text:str, n:int = 3):
+    """
+    Splits a string into its set of character n-grams. The string is padded so that short words still produce grams.
+
+    Args:
+        text (str): A normalized string.
+        n (int, optional): Gram size.
+
+    Returns:
+        set: The character n-grams.
+    """
+    padded = " " * (n - 1) + text + " "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def levenshtein(a:str, b:str, partial:bool = False):
+    """
+    Levenshtein distance using the bit-parallel algorithm of Myers/Hyyrö. O(len(b)) big-int operations instead of the
+    O(len(a) * len(b)) table.
+
+    More on: https://en.wikipedia.org/wiki/Levenshtein_distance
+
+    Args:
+        a (str): First string.
+        b (str): Second string.
+        partial (bool, optional): Distance between a and the best matching substring of b instead.
+
+    Returns:
+        int: The edit distance.
+    """
+    if not a:
+        return 0 if partial else len(b)
+    if not b:
+        return len(a)
+
+    # variables.
+    peq = defaultdict(int)
+    for i, char in enumerate(a):
+        peq[char] |= 1 << i
+
+    mask = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    pv, mv, score = mask, 0, len(a)
+    best = score
+
+    for char in b:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & mask) ^ pv) | eq
+        ph = (mv | ~(xh | pv)) & mask
+        mh = pv & xh
+
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+
+        # A partial match may start anywhere in b, so the first row does not grow.
+        ph = ((ph << 1) | (not partial)) & mask
+        mh = (mh << 1) & mask
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv
+        best = min(best, score)
+
+    return best if partial else score
+
+
+def similarity(query:str, title:str):
+    """
+    Scores how close two normalized strings are, from 0 to 100. Mixes the plain ratio with a best-substring ratio
+    (scaled down like fuzzywuzzy WRatio), so that short queries still find long titles.
+
+    Args:
+        query (str): Normalized query.
+        title (str): Normalized title.
+
+    Returns:
+        int: The score.
+    """
+    shorter, longer = sorted((query, title), key = len)
+    if not shorter:
+        return 0
+
+    ratio = 1 - levenshtein(query, title) / len(longer)
+    partial = 1 - levenshtein(shorter, longer, partial = True) / len(shorter)
+
+    if len(longer) > 1.5 * len(shorter):
+        ratio = max(ratio, 0.9 * partial)
+
+    return round(100 * ratio)
+
+
+class FuzzySearch:
+    """
+    Fuzzy title search. Titles are normalized once and indexed by character trigrams; a query only scores the
+    shortlist of titles sharing the most trigrams with it, using a fast edit distance.
+
+    Args:
+        titles (iterable): The titles to be searched.
+        top_k (int, optional): Maximum amount of suggestions.
+        score_cutoff (int, optional): Minimum score (0-100) of a suggestion.
+        shortlist (int, optional): Candidates scored by edit distance per query.
+        max_posting (int, optional): Trigrams shared by more titles than this are skipped once other grams matched,
+            they carry little signal and would make a query scale with the catalog.
+    """
+
+    def __init__(self, titles, top_k:int = 5, score_cutoff:int = 0, shortlist:int = 200, max_posting:int = 20000):
+
+        # variables.
+        self.top_k = top_k
+        self.score_cutoff = score_cutoff
+        self.shortlist = shortlist
+        self.max_posting = max_posting
+
+        self.titles = list(titles)
+        self.keys = [normalize_title(title) for title in self.titles]
+        self.postings = defaultdict(lambda: array("I"))
+
+        for position, key in enumerate(self.keys):
+            for gram in ngrams(key):
+                self.postings[gram].append(position)
+
+        self.postings = dict(self.postings)
+
+    def extract(self, query:str, top_k:int = None, score_cutoff:int = None):
+        """
+        Returns the titles closest to a query, best first.
+
+        Args:
+            query (str): The user query.
+            top_k (int, optional): Overrides the instance top_k.
+            score_cutoff (int, optional): Overrides the instance score_cutoff.
+
+        Returns:
+            list: (title, score, position) tuples, score from 0 to 100.
+        """
+        # variables.
+        top_k = self.top_k if top_k is None else top_k
+        score_cutoff = self.score_cutoff if score_cutoff is None else score_cutoff
+        key = normalize_title(query)
+        counts = defaultdict(int)
+
+        # Rarest grams first, so that common ones can be skipped.
+        grams = sorted((self.postings[gram] for gram in ngrams(key) if gram in self.postings), key = len)
+
+        for posting in grams:
+            if len(posting) > self.max_posting and counts:
+                break
+            for position in posting:
+                counts[position] += 1
+
+        candidates = heapq.nlargest(self.shortlist, counts, key = counts.get)
+
+        scored = []
+        for position in candidates:
+            score = similarity(key, self.keys[position])
+            if score >= score_cutoff:
+                scored.append((self.titles[position], score, position))
+
+        # Ties are broken by shared trigrams, so the closest of several partial matches comes first.
+        return heapq.nlargest(top_k, scored, key = lambda match: (match[1], counts[match[2]], -match[2]))
@@ -0,0 +1,317 @@
+import numpy as np
+import pandas as pd
+
+
+class TokenIndex:
+    """
+    Inverted index over a delimited column (e.g. Genres, Studios). Built once at load time, maps every token to the
+    row positions that contain it, already ordered by a ranking column.
+
+    Args:
+        data (pd.DataFrame): The dataset to be indexed.
+        column (str): The delimited column to be parsed.
+        sort_by (str): Ranking column. Positions are kept in descending order of it.
+        sep (str, optional): Token separator. Both Genres and Studios are pipe-delimited in the processed dataset.
+    """
+
+    def __init__(self, data:pd.DataFrame, column:str, sort_by:str = "Completed_count", sep:str = "|"):
+
+        # variables.
+        order = np.argsort(-data[sort_by].to_numpy(), kind = "stable")
+        ranked = pd.Series(data[column].to_numpy(dtype = object)[order], index = order).fillna("") # categorical safe.
+
+        tokens = ranked.str.split(sep, regex = False).explode().str.strip()
+        tokens = tokens[tokens != ""]
+        positions = tokens.index.to_numpy()
+
+        self.postings = {token: positions[index].astype(np.int64)
+                         for token, index in tokens.groupby(tokens.to_numpy(), sort = False).indices.items()}
+
+    def lookup(self, token:str):
+        """
+        Returns the row positions holding an exact token. O(result).
+
+        Args:
+            token (str): The exact token (no substring matching).
+
+        Returns:
+            np.ndarray: Row positions, ranked. Empty if the token is unknown.
+        """
+        return self.postings.get(token, np.empty(0, dtype = np.int64))
+
+    def __contains__(self, token:str):
+        return token in self.postings
+
+
+class RecommendationGraph:
+    """
+    Compressed sparse row (CSR) adjacency of the user recommendation pairs, keyed by Anime_id. Neighbors of each title
+    are stored as row positions of the anime dataset, pre-sorted by Num_recommenders, so a lookup is a slice.
+
+    Args:
+        recomendations (pd.DataFrame): Recommendation pairs (Animea, Animeb, Num_recommenders).
+        anime_info (pd.DataFrame): The anime dataset the neighbors point to.
+    """
+
+    def __init__(self, recomendations:pd.DataFrame, anime_info:pd.DataFrame):
+
+        # variables.
+        source = recomendations["Animea"].to_numpy()
+        weights = recomendations["Num_recommenders"].to_numpy()
+        targets = pd.Index(anime_info["Anime_id"]).get_indexer(recomendations["Animeb"])
+
+        # Pairs pointing outside of the dataset cannot be displayed, nor can a title be similar to itself.
+        known = (targets != -1) & (source != anime_info["Anime_id"].to_numpy()[np.maximum(targets, 0)])
+        source, weights, targets = source[known], weights[known], targets[known]
+
+        # Duplicate pairs are merged, their recommenders summed (runs of equal pairs once sorted).
+        order = np.lexsort((targets, source))
+        source, weights, targets = source[order], weights[order], targets[order]
+        changed = np.ones(len(source), dtype = bool)
+        changed[1:] = (source[1:] != source[:-1]) | (targets[1:] != targets[:-1])
+        first = np.flatnonzero(changed)
+        weights = np.add.reduceat(weights, first) if len(first) else weights
+        source, targets = source[first], targets[first]
+
+        # Sorted by source, then by descending weight (lexsort uses the last key as primary).
+        order = np.lexsort((-weights, source))
+
+        self.ids, counts = np.unique(source[order], return_counts = True)
+        self.indptr = np.concatenate(([0], np.cumsum(counts)))
+        self.neighbors = targets[order].astype(np.int64)
+        self.weights = weights[order]
+
+        # Row positions of the sources, for the position keyed transition matrix of deep (built on first use).
+        self.size = len(anime_info)
+        self.positions = pd.Index(anime_info["Anime_id"]).get_indexer(self.ids)
+        self.transitions = None
+
+    def lookup(self, anime_id:int):
+        """
+        Returns the neighbors of a title. O(log n) to find the row, then a slice.
+
+        Args:
+            anime_id (int): The reference Anime_id.
+
+        Returns:
+            tuple(np.ndarray, np.ndarray): Row positions in the anime dataset and their Num_recommenders, most
+            recommended first. Both empty if the title has no recommendations.
+        """
+        i = np.searchsorted(self.ids, anime_id)
+
+        if i == len(self.ids) or self.ids[i] != anime_id:
+            return np.empty(0, dtype = np.int64), self.weights[:0]
+
+        start, stop = self.indptr[i], self.indptr[i + 1]
+        return self.neighbors[start:stop], self.weights[start:stop]
+
+    def transition(self):
+        """
+        Returns the random walk transition matrix, in CSR keyed by row position: the out-pairs of every title,
+        weighted by Num_recommenders and normalized per row. Built once.
+
+        Returns:
+            tuple(np.ndarray, np.ndarray, np.ndarray): indptr (size + 1), target positions, probabilities.
+        """
+        if self.transitions is None:
+            sources = np.repeat(self.positions, np.diff(self.indptr))
+            known = sources != -1
+            sources, targets, weights = sources[known], self.neighbors[known], self.weights[known].astype(np.float64)
+
+            order = np.argsort(sources, kind = "stable")
+            sources, targets, weights = sources[order], targets[order], weights[order]
+
+            indptr = np.zeros(self.size + 1, dtype = np.int64)
+            np.cumsum(np.bincount(sources, minlength = self.size), out = indptr[1:])
+
+            # Rows without any recommender are dangling (no probability to move).
+            totals = np.bincount(sources, weights = weights, minlength = self.size)[sources]
+            probabilities = np.divide(weights, totals, out = np.zeros_like(weights), where = totals > 0)
+
+            self.transitions = (indptr, targets, probabilities)
+
+        return self.transitions
+
+    def deep(self, anime_id:int, top_k:int = 50, alpha:float = 0.25, hops:int = 4, epsilon:float = 1e-4):
+        """
+        Scores the titles reachable from a title within a few hops, by personalized PageRank: a walk that follows
+        pairs in proportion to Num_recommenders and restarts at the title with probability alpha. Computed by
+        vectorized push rounds over the active frontier only (forward push), so the cost follows the neighborhood
+        and epsilon, not the size of the graph. Stops after `hops` rounds, once nothing is left to push, or once the
+        top_k cannot change anymore.
+
+        Args:
+            anime_id (int): The reference Anime_id.
+            top_k (int, optional): Titles returned.
+            alpha (float, optional): Restart probability. Higher keeps the results closer to the title.
+            hops (int, optional): Push rounds, i.e. the farthest hop reached.
+            epsilon (float, optional): A title is pushed further while its mass exceeds epsilon per out-pair.
+
+        Returns:
+            tuple(np.ndarray, np.ndarray): Row positions in the anime dataset and their scores, best first. The title
+            itself is excluded. Both empty if the title has no recommendations.
+        """
+        i = np.searchsorted(self.ids, anime_id)
+
+        if i == len(self.ids) or self.ids[i] != anime_id or self.positions[i] == -1:
+            return np.empty(0, dtype = np.int64), np.empty(0)
+
+        # variables.
+        indptr, targets, probabilities = self.transition()
+        seed = self.positions[i]
+        scores = np.zeros(self.size)
+        residual = np.zeros(self.size)
+        residual[seed] = 1.0
+        remaining = 1.0
+        active = np.array([seed])
+        reached = np.array([seed])
+
+        for _ in range(hops):
+            mass = residual[active]
+            residual[active] = 0.0
+            scores[active] += alpha * mass
+
+            # Every out-pair of the active titles at once: edge indices of their CSR rows, concatenated.
+            starts, counts = indptr[active], indptr[active + 1] - indptr[active]
+            offsets = np.cumsum(counts) - counts
+            edges = np.repeat(starts - offsets, counts) + np.arange(counts.sum())
+            pushed = np.repeat((1 - alpha) * mass, counts) * probabilities[edges]
+
+            touched, inverse = np.unique(targets[edges], return_inverse = True)
+            residual[touched] += np.bincount(inverse, weights = pushed, minlength = len(touched))
+
+            # Mass of dangling titles restarts at the reference title.
+            residual[seed] += (1 - alpha) * mass.sum() - pushed.sum()
+            remaining -= alpha * mass.sum()
+
+            reached = np.union1d(reached, touched)
+            degrees = indptr[reached + 1] - indptr[reached]
+            active = reached[residual[reached] > epsilon * np.maximum(degrees, 1)]
+            if not active.size:
+                break
+
+            # Early exit: unpushed mass can move any estimate by at most `remaining`.
+            estimate = scores[reached] + alpha * residual[reached]
+            estimate[reached == seed] = 0.0
+            if len(reached) > top_k + 1:
+                ordered = -np.partition(-estimate, top_k)[:top_k + 1]
+                if ordered[:top_k].min() - ordered[top_k] > 2 * remaining:
+                    break
+
+        # The frontier left unpushed is counted as if it stopped there.
+        estimate = scores[reached] + alpha * residual[reached]
+        estimate[reached == seed] = 0.0
+
+        order = np.argsort(-estimate, kind = "stable")[:top_k]
+        order = order[estimate[order] > 0]
+        return reached[order], estimate[order]
+
+
+def normalize_title(title:str):
+    """
+    Normalizes a title into a lookup key: "(TV)" stripped (as in data_processing.anime_processor), case-folded and
+    whitespace-collapsed.
+
+    Args:
+        title (str): The title to be normalized. Non strings (e.g. Treeview values) are converted.
+
+    Returns:
+        str: The lookup key.
+    """
+    return " ".join(str(title).replace("(TV)", "").casefold().split())
+
+
+class TitleIndex:
+    """
+    Hash index from title to Anime_id and row position. Shared by every title lookup of the application. Exact titles
+    are matched first, so distinct titles that normalize to the same key stay reachable.
+
+    Args:
+        data (pd.DataFrame): The anime dataset (Title, Anime_id).
+    """
+
+    def __init__(self, data:pd.DataFrame):
+
+        self.exact = {}
+        self.entries = {}
+
+        for position, (title, anime_id) in enumerate(zip(data["Title"].to_numpy(), data["Anime_id"].to_numpy())):
+            self.exact.setdefault(str(title), (int(anime_id), position))
+            self.entries.setdefault(normalize_title(title), (int(anime_id), position)) # first occurrence wins.
+
+    def lookup(self, title:str):
+        """
+        Exact title lookup, falling back to a case-insensitive match of the normalized title. O(1).
+
+        Args:
+            title (str): The title to be searched.
+
+        Returns:
+            tuple(int, int) | None: Anime_id and row position, None if the title is unknown.
+        """
+        match = self.exact.get(str(title))
+        return match if match is not None else self.entries.get(normalize_title(title))
+
+    def __contains__(self, title:str):
+        return str(title) in self.exact or normalize_title(title) in self.entries
+
+
+# Columns the result views can be sorted by.
+SORTABLE = ("Title", "Studios", "Rank", "Year", "Completed_count")
+
+
+class SortOrders:
+    """
+    Sort permutations of the dataset, one per sortable column, computed once at load time. Each is kept as the rank of
+    every row in that order, so any subset of rows (the positions of a view) is ordered by argsorting a few integers,
+    whatever the type of the column. Titles and studios are ordered case-insensitively, missing values last in either
+    direction.
+
+    Args:
+        data (pd.DataFrame): The anime dataset.
+        columns (tuple, optional): The sortable columns.
+        zero_missing (tuple, optional): Numeric columns where 0 stands for a missing value (unranked titles, unknown
+            years, see data_processing).
+    """
+
+    def __init__(self, data:pd.DataFrame, columns:tuple = SORTABLE, zero_missing:tuple = ("Rank", "Year")):
+
+        self.ranks = {}
+        self.valid = {} # rows with a value, ranked before the missing ones.
+
+        for column in columns:
+            values = data[column]
+            missing = values.isna().to_numpy(copy = True)
+
+            if pd.api.types.is_numeric_dtype(values):
+                if column in zero_missing:
+                    missing |= values.to_numpy() == 0
+                key = np.where(missing, np.inf, values.to_numpy(dtype = np.float64)) # inf sorts after any value.
+                order = np.argsort(key, kind = "stable")
+            else:
+                # object strings (no fixed width copy), missing values last whatever the titles hold.
+                key = pd.Series(values.astype(object).to_numpy(), copy = False).str.casefold()
+                order = key.sort_values(kind = "stable", na_position = "last").index.to_numpy()
+
+            self.valid[column] = int(len(values) - missing.sum())
+            ranks = np.empty(len(order), dtype = np.int32)
+            ranks[order] = np.arange(len(order), dtype = np.int32)
+            self.ranks[column] = ranks
+
+    def argsort(self, positions:np.ndarray, column:str, descending:bool = False):
+        """
+        Orders a subset of rows. O(k log k) in the size of the subset, never a string comparison.
+
+        Args:
+            positions (np.ndarray): Row positions of the subset.
+            column (str): A sortable column.
+            descending (bool, optional): Largest first. Missing values stay last.
+
+        Returns:
+            np.ndarray: Indices into positions, in the order of the column.
+        """
+        ranks = self.ranks[column][positions]
+        return np.lexsort((-ranks if descending else ranks, ranks >= self.valid[column])) # last key is primary.
+
+    def __contains__(self, column:str):
+        return column in self.ranks
@@ -0,0 +1,136 @@
+import json
+import sqlite3
+import threading
+import time
+
+
+class JikanCache:
+    """
+    Persistent cache of Jikan responses, stored in SQLite. Entries are keyed by endpoint and Anime_id, expire after a
+    per-endpoint TTL and are evicted least recently used first once the cache grows over its byte budget.
+
+    Args:
+        path (str): The SQLite file.
+        ttl (dict): Seconds an entry stays valid, per endpoint (e.g. {"anime": 604800, "reviews": 86400}).
+        max_bytes (int): Byte budget of the stored responses.
+    """
+
+    def __init__(self, path:str, ttl:dict, max_bytes:int):
+
+        # variables.
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock() # the cache is shared with API worker threads.
+
+        self.connection = sqlite3.connect(path, check_same_thread = False)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                endpoint TEXT NOT NULL,
+                anime_id INTEGER NOT NULL,
+                body TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (endpoint, anime_id))""")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at)")
+        self.connection.commit()
+
+    def get(self, endpoint:str, anime_id:int):
+        """
+        Returns a cached response, None if it is missing or expired.
+
+        Args:
+            endpoint (str): The Jikan endpoint ("anime", "reviews", ...).
+            anime_id (int): The Anime_id.
+
+        Returns:
+            dict | None: The JSON response.
+        """
+        now = time.time()
+
+        with self.lock:
+            row = self.connection.execute("SELECT body, fetched_at FROM responses WHERE endpoint = ? AND anime_id = ?",
+                                          (endpoint, anime_id)).fetchone()
+
+            if row is None or now - row[1] > self.ttl.get(endpoint, 0):
+                self.misses += 1
+                return None
+
+            self.connection.execute("UPDATE responses SET accessed_at = ? WHERE endpoint = ? AND anime_id = ?",
+                                    (now, endpoint, anime_id))
+            self.connection.commit()
+            self.hits += 1
+
+        return json.loads(row[0])
+
+    def put(self, endpoint:str, anime_id:int, data:dict):
+        """
+        Stores a response, then evicts least recently used entries until the cache fits its byte budget.
+
+        Args:
+            endpoint (str): The Jikan endpoint ("anime", "reviews", ...).
+            anime_id (int): The Anime_id.
+            data (dict): The JSON response.
+        """
+        body = json.dumps(data)
+        now = time.time()
+
+        with self.lock:
+            self.connection.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                                    (endpoint, anime_id, body, len(body), now, now))
+            self.evict()
+            self.connection.commit()
+
+    def fetch(self, endpoint:str, anime_id:int, loader:callable):
+        """
+        Returns a cached response, calling the loader and storing its result on a miss.
+
+        Args:
+            endpoint (str): The Jikan endpoint ("anime", "reviews", ...).
+            anime_id (int): The Anime_id.
+            loader (callable): Performs the actual request.
+
+        Returns:
+            dict: The JSON response.
+        """
+        data = self.get(endpoint, anime_id)
+
+        if data is None:
+            data = loader()
+            self.put(endpoint, anime_id, data)
+
+        return data
+
+    def evict(self):
+        """
+        Deletes least recently used entries while the stored bytes exceed the budget. Expects the lock to be held.
+        """
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+        if total <= self.max_bytes:
+            return
+
+        victims = []
+        for endpoint, anime_id, size in self.connection.execute("SELECT endpoint, anime_id, size FROM responses ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            victims.append((endpoint, anime_id))
+            total -= size
+
+        self.connection.executemany("DELETE FROM responses WHERE endpoint = ? AND anime_id = ?", victims)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Hit/miss counters, stored entries and bytes.
+        """
+        with self.lock:
+            entries, size = self.connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
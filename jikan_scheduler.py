@@ -0,0 +1,204 @@
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+# Request priorities, lower runs first.
+INTERACTIVE = 0
+BACKGROUND = 10
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter. Allows short bursts while holding the long run average to `rate` per second.
+
+    Args:
+        rate (float): Tokens added per second.
+        burst (int): Bucket capacity.
+    """
+
+    def __init__(self, rate:float, burst:int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def acquire(self):
+        """
+        Takes a token, sleeping until one is available.
+        """
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            time.sleep((1 - self.tokens) / self.rate)
+
+
+class JikanScheduler:
+    """
+    Single long-lived scheduler for every Jikan request of the application. One worker thread runs the requests
+    through a token bucket and a pooled HTTP session; identical in-flight requests are coalesced, higher priority
+    (interactive) requests jump the queue, 429/5xx responses are retried with exponential backoff. Responses go through
+    the persistent cache, hits never reach the queue.
+
+    Args:
+        cache (JikanCache): The response cache.
+        base_url (str, optional): Jikan base URL, None for api.jikan.moe.
+        rate (float, optional): Requests per second.
+        burst (int, optional): Requests allowed back to back.
+        retries (int, optional): Retries on 429/5xx and connection errors.
+        backoff (float, optional): First retry delay in seconds, doubled on every retry.
+    """
+
+    def __init__(self, cache, base_url:str = None, rate:float = 1.0, burst:int = 2, retries:int = 4, backoff:float = 1.0):
+
+        # variables.
+        self.cache = cache
+        self.base_url = base_url
+        self.bucket = TokenBucket(rate, burst)
+        self.retries = retries
+        self.backoff = backoff
+
+        self.queue = queue.PriorityQueue()
+        self.pending = {} # (endpoint, anime_id) -> [Future, priority]
+        self.lock = threading.Lock()
+        self.sequence = itertools.count()
+        self.client = None
+
+        threading.Thread(target = self.worker, daemon = True).start()
+
+    def submit(self, endpoint:str, anime_id:int, priority:int = INTERACTIVE):
+        """
+        Schedules a request.
+
+        Args:
+            endpoint (str): "anime" for the details, or an extension such as "reviews".
+            anime_id (int): The Anime_id.
+            priority (int, optional): INTERACTIVE or BACKGROUND.
+
+        Returns:
+            Future: Resolves to the JSON response. Already done on a cache hit.
+        """
+        key = (endpoint, anime_id)
+
+        with self.lock:
+            if key in self.pending:
+                entry = self.pending[key]
+                if priority < entry[1]: # bumped: the stale queue entry is skipped once popped.
+                    entry[1] = priority
+                    self.queue.put((priority, next(self.sequence), key))
+                return entry[0]
+
+        future = Future()
+        data = self.cache.get(endpoint, anime_id)
+
+        if data is not None:
+            future.set_result(data)
+            return future
+
+        with self.lock:
+            if key in self.pending: # submitted by another thread meanwhile.
+                return self.pending[key][0]
+            self.pending[key] = [future, priority]
+            self.queue.put((priority, next(self.sequence), key))
+
+        return future
+
+    def cancel(self, priority:int = BACKGROUND):
+        """
+        Drops every queued request of a priority (or lower) that has not started yet.
+
+        Args:
+            priority (int, optional): Requests at this priority or lower are cancelled.
+        """
+        with self.lock:
+            for key, (future, entry_priority) in list(self.pending.items()):
+                if entry_priority >= priority and future.cancel():
+                    del self.pending[key]
+
+    def worker(self):
+        """
+        Runs queued requests, one at a time, within the rate limit.
+        """
+        while True:
+            priority, _, key = self.queue.get()
+
+            with self.lock:
+                entry = self.pending.get(key)
+                if entry is None or entry[1] != priority:
+                    continue # cancelled, or a stale entry of a bumped request.
+                if not entry[0].set_running_or_notify_cancel():
+                    del self.pending[key]
+                    continue
+
+            try:
+                data = self.request(*key)
+                self.cache.put(*key, data)
+            except Exception as e:
+                result = (False, e)
+            else:
+                result = (True, data)
+
+            with self.lock:
+                del self.pending[key]
+
+            if result[0]:
+                entry[0].set_result(result[1])
+            else:
+                entry[0].set_exception(result[1])
+
+    def request(self, endpoint:str, anime_id:int):
+        """
+        Performs a request through the shared client, retrying with backoff on 429/5xx and connection errors.
+
+        Args:
+            endpoint (str): "anime" for the details, or an extension such as "reviews".
+            anime_id (int): The Anime_id.
+
+        Returns:
+            dict: The JSON response.
+        """
+        import requests
+        from jikanpy import Jikan
+
+        if self.client is None:
+            self.client = Jikan(selected_base = self.base_url, session = requests.Session()) # pooled connections.
+
+        extension = None if endpoint == "anime" else endpoint
+
+        return with_retries(lambda: self.client.anime(anime_id, extension = extension), self.bucket, self.retries, self.backoff)
+
+
+def with_retries(call:callable, bucket:TokenBucket, retries:int = 4, backoff:float = 1.0):
+    """
+    Runs a Jikan call within a rate limit, retrying with exponential backoff on 429/5xx and connection errors.
+
+    Args:
+        call (callable): Performs the request, without arguments.
+        bucket (TokenBucket): The rate limit, one token per attempt.
+        retries (int, optional): Retries before the error is raised.
+        backoff (float, optional): First retry delay in seconds, doubled on every retry.
+
+    Returns:
+        dict: The JSON response.
+    """
+    import requests
+    from jikanpy.exceptions import APIException
+
+    for attempt in range(retries + 1):
+        bucket.acquire()
+        try:
+            return call()
+        except APIException as e:
+            if attempt == retries or not (e.status_code == 429 or e.status_code >= 500):
+                raise
+        except requests.exceptions.ConnectionError:
+            if attempt == retries:
+                raise
+        time.sleep(backoff * 2 ** attempt)
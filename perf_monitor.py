@@ -0,0 +1,176 @@
+import functools
+import json
+import logging
+import logging.handlers
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+
+class PerfMonitor:
+    """
+    Runtime timings of the application: spans around the main callbacks, waits on Jikan and cover requests, and the
+    lag of the Tk event loop. Every record goes to a rotating log (one JSON object per line) and to a window of recent
+    values per name, summarized by the overlay. Disabled, a timed callback costs one attribute check and nothing is
+    logged or scheduled. Enabled with `python app.py --perf` or perf.enabled in config.yaml.
+    """
+
+    def __init__(self):
+
+        # variables.
+        self.enabled = False
+        self.window = 500
+        self.lag_threshold = 0.05
+        self.samples = {}
+        self.logger = None
+        self.lock = threading.Lock()
+
+    def configure(self, log_path:str, max_bytes:int = 1048576, backups:int = 3, window:int = 500, lag_threshold:int = 50):
+        """
+        Enables the monitor.
+
+        Args:
+            log_path (str): The log file, rotated once it reaches max_bytes.
+            max_bytes (int, optional): Bytes per log file.
+            backups (int, optional): Rotated files kept.
+            window (int, optional): Latest values kept per name for the overlay.
+            lag_threshold (int, optional): Event loop lag (ms) from which a lag sample is logged. Every sample counts for the overlay.
+        """
+        handler = logging.handlers.RotatingFileHandler(log_path, maxBytes = max_bytes, backupCount = backups, encoding = "utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+
+        self.logger = logging.getLogger("myAnimeTerminal.perf")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.logger.addHandler(handler)
+
+        self.window = window
+        self.lag_threshold = lag_threshold / 1000
+        self.enabled = True
+
+    def record(self, name:str, seconds:float, log:bool = True, **fields):
+        """
+        Records a timing. Safe from any thread.
+
+        Args:
+            name (str): The span name.
+            seconds (float): The duration.
+            log (bool, optional): Written to the log too.
+            **fields: Extra fields of the log record.
+        """
+        if not self.enabled:
+            return
+
+        with self.lock:
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen = self.window)
+            self.samples[name].append(seconds)
+
+        if log:
+            self.logger.info(json.dumps({"ts": round(time.time(), 3), "span": name, "ms": round(seconds * 1000, 3), **fields}))
+
+    def timed(self, name:str = None):
+        """
+        Decorator timing every call of a function while the monitor is enabled.
+
+        Args:
+            name (str, optional): The span name, the function name by default.
+        """
+        def decorator(function):
+            span = name or function.__name__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+
+                begin = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.record(span, time.perf_counter() - begin)
+            return wrapper
+        return decorator
+
+    def watch_loop(self, root, interval:int = 100):
+        """
+        Measures the event loop lag: a callback is scheduled every interval, the lag is how late it runs. Lags from
+        lag_threshold on are logged, they are the stalls a user notices.
+
+        Args:
+            root (tk.Tk): The application window.
+            interval (int, optional): Milliseconds between two samples.
+        """
+        if not self.enabled:
+            return
+
+        def sample(scheduled:float):
+            lag = max(time.perf_counter() - scheduled - interval / 1000, 0.0)
+            self.record("loop_lag", lag, log = lag >= self.lag_threshold)
+            root.after(interval, sample, time.perf_counter())
+
+        root.after(interval, sample, time.perf_counter())
+
+    def summary(self):
+        """
+        Returns:
+            dict: name -> count, p50/p95/max in milliseconds over the recent window.
+        """
+        with self.lock:
+            samples = {name: np.array(values) * 1000 for name, values in self.samples.items() if values}
+
+        return {name: {"count": len(values), **dict(zip(("p50", "p95"), np.percentile(values, (50, 95)).tolist())), "max": float(values.max())}
+                for name, values in sorted(samples.items())}
+
+
+class PerfOverlay:
+    """
+    Toggleable text overlay of the recent timings and cache hit rates, refreshed while it is shown.
+
+    Args:
+        root (tk.Tk): The application window.
+        monitor (PerfMonitor): The monitor summarized.
+        caches (callable): Returns name -> stats dict (hits, misses) of the caches opened so far.
+        refresh (int, optional): Milliseconds between two refreshes.
+    """
+
+    def __init__(self, root, monitor:PerfMonitor, caches:callable, refresh:int = 500):
+        import tkinter as tk
+
+        # variables.
+        self.root = root
+        self.monitor = monitor
+        self.caches = caches
+        self.refresh = refresh
+        self.job = None
+
+        self.label = tk.Label(root, background = "#000000", foreground = "#39FF14", justify = "left", anchor = "nw",
+                              font = ("Courier", 9), borderwidth = 1, relief = "solid")
+
+    def toggle(self):
+        if self.job is None:
+            self.update()
+        else:
+            self.root.after_cancel(self.job)
+            self.job = None
+            self.label.place_forget()
+
+    def update(self):
+        lines = [f"{'span':<20}{'n':>6}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}"]
+        for name, stats in self.monitor.summary().items():
+            lines.append(f"{name[:19]:<20}{stats['count']:>6}{stats['p50']:>9.1f}{stats['p95']:>9.1f}{stats['max']:>9.1f}")
+
+        for name, stats in self.caches().items():
+            total = stats["hits"] + stats["misses"]
+            rate = f"{stats['hits'] / total:.0%}" if total else "-"
+            lines.append(f"{name} hits: {rate} ({stats['hits']}/{total})")
+
+        self.label.configure(text = "\n".join(lines))
+        self.label.place(x = 8, y = 8)
+        self.label.lift()
+        self.job = self.root.after(self.refresh, self.update)
+
+
+monitor = PerfMonitor()
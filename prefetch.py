@@ -0,0 +1,71 @@
+from jikan_scheduler import BACKGROUND
+
+
+class Prefetcher:
+    """
+    Speculatively warms the Jikan cache for the titles a user is likely to open next: the top rows of the current
+    result view and the row under the cursor. Requests run at background priority, within the scheduler rate limit,
+    and queued ones are dropped whenever the view changes.
+
+    Args:
+        scheduler (JikanScheduler): The shared request scheduler.
+        titles_index (TitleIndex): Resolves titles to Anime_id.
+        top_n (int, optional): Rows warmed per view.
+        endpoints (tuple, optional): Endpoints warmed per title.
+        covers (CoverCache, optional): Also warms the cover thumbnail, once the details are known.
+        cover_size (tuple, optional): Thumbnail (width, height), as displayed.
+    """
+
+    def __init__(self, scheduler, titles_index, top_n:int = 5, endpoints:tuple = ("anime", "reviews"), covers = None, cover_size:tuple = (364, 325)):
+        self.scheduler = scheduler
+        self.titles_index = titles_index
+        self.top_n = top_n
+        self.endpoints = endpoints
+        self.covers = covers
+        self.cover_size = cover_size
+        self.hovered = None
+
+    def view_changed(self, titles):
+        """
+        Cancels the queued prefetches of the previous view, then warms the first top_n titles of the new one.
+
+        Args:
+            titles (iterable): Titles of the new view, in display order.
+        """
+        self.scheduler.cancel(BACKGROUND)
+        self.hovered = None
+
+        for title in list(titles)[:self.top_n]:
+            self.warm(title)
+
+    def hover(self, title:str):
+        """
+        Warms the title under the cursor, once per row entered.
+
+        Args:
+            title (str): The hovered title.
+        """
+        if title != self.hovered:
+            self.hovered = title
+            self.warm(title)
+
+    def warm(self, title:str):
+        found = self.titles_index.lookup(title)
+
+        if found is not None:
+            for endpoint in self.endpoints:
+                request = self.scheduler.submit(endpoint, found[0], priority = BACKGROUND)
+                if endpoint == "anime" and self.covers is not None:
+                    request.add_done_callback(self.warm_cover)
+
+    def warm_cover(self, request):
+        """
+        Done callback of a details request. Schedules its cover thumbnail.
+
+        Args:
+            request (Future): The finished details request.
+        """
+        if request.cancelled() or request.exception() is not None:
+            return
+
+        self.covers.submit(request.result()["data"]["images"]["jpg"]["large_image_url"], self.cover_size)
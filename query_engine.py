@@ -0,0 +1,336 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from indexes import TokenIndex, RecommendationGraph, TitleIndex, SortOrders, SORTABLE
+from data.data_processing import load_snapshot, snapshot_exporter, merge_anime_delta, merge_recomendation_delta
+
+
+'''
+NOTE: The query layer of the application (genre/studio browse, "similar to", fuzzy "what did you mean"), without any
+display. AnimeApp renders its results; run as a script, it answers queries from the command line or stdin as JSON Lines:
+
+    python query_engine.py "Cowboy Bebop" Action Madhouse
+    python query_engine.py --catalog --top 20 > recommendations.jsonl
+    python query_engine.py --sort=-Year Action
+    cat titles.txt | python query_engine.py --kind similar
+'''
+
+
+def load_data(filepath:str, sep=None):
+
+    '''
+    Loads CSV data with optional parameters. The binary snapshot next to it (see data_processing.snapshot_exporter)
+    is preferred, the CSV is only parsed when the snapshot is missing or older than the CSV, and a fresh snapshot
+    is then written for the next launch.
+
+    Args:
+        filepath (str): Path to the dataset.
+        sep (str, optional): Type of column separator.
+
+    Returns:
+        pd.DataFrame: Loaded DataFrame.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        pd.errors.EmptyDataError: If the file is empty.
+        pd.errors.ParserError: If parsing fails.
+    '''
+    snapshot = os.path.splitext(filepath)[0] + ".snapshot"
+    data = load_snapshot(snapshot, source = filepath)
+
+    if data is not None:
+        return data
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(f"File not found {filepath}")
+    try:
+        if sep is not None:
+            data = pd.read_csv(filepath, sep = sep)
+        else:
+            data = pd.read_csv(filepath)
+    except Exception as e:
+        raise RecursionError(f"Failed to load data. {filepath}")
+
+    try:
+        snapshot_exporter(data, snapshot, source = filepath)
+    except OSError as e: # read-only install, the CSV is still usable.
+        print(f"Error writing snapshot: {e}", file = sys.stderr)
+
+    return data
+
+def load_delta(filepath:str):
+    """
+    Args:
+        filepath (str): A delta file of refresh.py.
+
+    Returns:
+        pd.DataFrame | None: The delta file, None before the first refresh.
+    """
+    return pd.read_csv(filepath) if os.path.exists(filepath) else None
+
+def load_anime_info(refresh:dict):
+    """
+    Loads the processed anime dataset, with the titles refreshed by refresh.py merged over it.
+
+    Args:
+        refresh (dict): The refresh section of config.yaml.
+    """
+    data = load_data(os.path.join("data", "anime_info_processed.csv"))
+    delta = load_delta(refresh["anime_delta"])
+
+    return data if delta is None else merge_anime_delta(data, delta)
+
+def load_recomendations(refresh:dict):
+    """
+    Loads the processed recommendations, with the pairs refreshed by refresh.py merged over them.
+
+    Args:
+        refresh (dict): The refresh section of config.yaml.
+    """
+    data = load_data(os.path.join("data", "anime_rec_processed.csv"))
+    anime_delta = load_delta(refresh["anime_delta"])
+    delta = load_delta(refresh["recomendations_delta"])
+
+    if anime_delta is None or delta is None:
+        return data
+    return merge_recomendation_delta(data, delta, anime_delta)
+
+
+class QueryEngine:
+    """
+    Answers the queries of the application over indexes built once. Recommendations and the fuzzy search are only
+    loaded on first use. Every answer is a dict: the query, its kind ("genre", "studio", "similar", "deep" or
+    "did_you_mean"), the title as spelled in the dataset (similar/deep), and the row positions of the results in
+    anime_info, best first, with their scores when there are any.
+
+    Args:
+        anime_info (pd.DataFrame): The processed anime dataset.
+        genres (list): Genres offered for browsing.
+        studios (list): Studios offered for browsing.
+        recomendations (callable): Loads the recommendation pairs.
+        search (dict, optional): FuzzySearch settings (search section of config.yaml).
+        deep_similar (dict, optional): Deep similar settings (deep_similar section of config.yaml).
+    """
+
+    def __init__(self, anime_info:pd.DataFrame, genres:list, studios:list, recomendations:callable, search:dict = None, deep_similar:dict = None):
+
+        # variables.
+        self.anime_info = anime_info
+        self.genres = set(genres)
+        self.studios = set(studios)
+        self.recomendations = recomendations
+        self.search = search or {}
+        self.deep_similar = deep_similar or {"min_direct": 0}
+        self.graph = None
+        self.fuzzy = None
+        self.columns = {} # JSON ready columns of rows.
+
+        # Each pick becomes a lookup instead of a full column scan.
+        self.genres_index = TokenIndex(anime_info, "Genres")
+        self.studios_index = TokenIndex(anime_info, "Studios")
+        self.titles_index = TitleIndex(anime_info)
+
+        # Any view can be re-sorted by these without sorting strings again.
+        self.sort_orders = SortOrders(anime_info)
+
+    @classmethod
+    def from_config(cls, filepath:str = "config.yaml"):
+        """
+        Builds the engine of the application, as configured.
+
+        Args:
+            filepath (str, optional): Path to the YAML config.
+        """
+        with open(filepath) as file:
+            config = yaml.safe_load(file)
+
+        return cls(load_anime_info(config["refresh"]), config["genres"], config["studios"],
+                   recomendations = lambda: load_recomendations(config["refresh"]),
+                   search = config["search"], deep_similar = config["deep_similar"])
+
+    def recomendations_graph(self):
+        if self.graph is None:
+            self.graph = RecommendationGraph(self.recomendations(), self.anime_info)
+        return self.graph
+
+    def fuzzy_search(self):
+        if self.fuzzy is None:
+            from fuzzy_search import FuzzySearch
+            self.fuzzy = FuzzySearch(self.anime_info["Title"], **self.search)
+        return self.fuzzy
+
+    def browse(self, value:str):
+        """
+        Args:
+            value (str): A genre or a studio.
+
+        Returns:
+            dict | None: Titles of the genre or studio, most completed first. None if it is neither.
+        """
+        if value in self.genres:
+            return {"query": value, "kind": "genre", "title": None, "positions": self.genres_index.lookup(value), "scores": None}
+        if value in self.studios:
+            return {"query": value, "kind": "studio", "title": None, "positions": self.studios_index.lookup(value), "scores": None}
+        return None
+
+    def similar(self, value:str):
+        """
+        Args:
+            value (str): A title, matched case and spacing insensitive.
+
+        Returns:
+            dict | None: Most recommended titles first (Num_recommenders as scores). Titles a few hops away, scored
+            by personalized PageRank, when there are fewer direct ones than deep_similar.min_direct. None if the
+            title is unknown.
+        """
+        found = self.titles_index.lookup(value)
+
+        if found is None:
+            return None
+
+        anime_id, position = found
+        graph = self.recomendations_graph()
+        positions, scores = graph.lookup(anime_id) # most recommended first, ties included.
+        kind = "similar"
+
+        # Obscure titles have few pairs: titles a few hops away are scored instead (deep similar).
+        deep = self.deep_similar
+        if len(positions) < deep["min_direct"]:
+            positions, scores = graph.deep(anime_id, top_k = deep["top_k"], alpha = deep["alpha"], hops = deep["hops"])
+            kind = "deep"
+
+        return {"query": value, "kind": kind, "title": self.anime_info["Title"].iat[position], "positions": positions, "scores": scores}
+
+    def did_you_mean(self, value:str):
+        """
+        Args:
+            value (str): A misspelled title.
+
+        Returns:
+            dict: Closest titles first (see fuzzy_search.py).
+        """
+        matches = self.fuzzy_search().extract(value)
+
+        return {"query": value, "kind": "did_you_mean", "title": None,
+                "positions": np.array([match[2] for match in matches], dtype = np.int64),
+                "scores": np.array([match[1] for match in matches])}
+
+    def query(self, value:str, kind:str = "auto"):
+        """
+        Answers a query the way the application does: a genre or studio is browsed, a known title gets its similar
+        titles, anything else gets the closest titles.
+
+        Args:
+            value (str): The query.
+            kind (str, optional): "auto", or one of "browse", "similar", "search" to force it.
+
+        Raises:
+            ValueError: if the kind is improperly determined.
+
+        Returns:
+            dict: The answer. Empty positions if a forced kind does not apply.
+        """
+        if kind not in ("auto", "browse", "similar", "search"):
+            raise ValueError(f"Kind argument is improperly determined.\nUse: 'auto', 'browse', 'similar' or 'search'.\nUsed: {kind}")
+
+        answer = None
+        if kind in ("auto", "browse"):
+            answer = self.browse(value)
+        if answer is None and kind in ("auto", "similar"):
+            answer = self.similar(value)
+        if answer is None and kind in ("auto", "search"):
+            answer = self.did_you_mean(value)
+
+        return answer or {"query": value, "kind": None, "title": None, "positions": np.empty(0, dtype = np.int64), "scores": None}
+
+    def sort(self, answer:dict, column:str, descending:bool = False):
+        """
+        Args:
+            answer (dict): An answer of query.
+            column (str): A sortable column of anime_info (Title, Studios, Rank, Year, Completed_count).
+            descending (bool, optional): Largest first.
+
+        Raises:
+            ValueError: if the column is not sortable.
+
+        Returns:
+            dict: The answer, its results (and scores) in the order of the column.
+        """
+        if column not in self.sort_orders:
+            raise ValueError(f"Column argument is improperly determined.\nUse one of: {', '.join(self.sort_orders.ranks)}.\nUsed: {column}")
+
+        order = self.sort_orders.argsort(answer["positions"], column, descending = descending)
+        return {**answer, "positions": answer["positions"][order], "scores": None if answer["scores"] is None else answer["scores"][order]}
+
+    def rows(self, answer:dict, top:int = None, columns:tuple = ("Title", "Anime_id", "Year", "Studios")):
+        """
+        Args:
+            answer (dict): An answer of query.
+            top (int, optional): Results kept, all by default.
+            columns (tuple, optional): Columns of anime_info kept.
+
+        Returns:
+            list: One dict per result, JSON serializable, with its score when the answer has scores.
+        """
+        positions = answer["positions"][:top]
+
+        for column in columns:
+            if column not in self.columns:
+                values = self.anime_info[column].astype(object)
+                self.columns[column] = values.where(values.notna(), None).to_numpy()
+
+        rows = [dict(zip(columns, row)) for row in zip(*(self.columns[column][positions].tolist() for column in columns))]
+        if answer["scores"] is not None:
+            for row, score in zip(rows, answer["scores"][:top].tolist()):
+                row["Score"] = score
+        return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Headless queries over the dataset, answered as JSON Lines.")
+    parser.add_argument("queries", nargs = "*", help = "genres, studios or titles. Read from stdin, one per line, if none.")
+    parser.add_argument("--kind", default = "auto", choices = ("auto", "browse", "similar", "search"))
+    parser.add_argument("--catalog", action = "store_true", help = "query every title of the dataset.")
+    parser.add_argument("--top", type = int, default = 50, help = "results per query, 0 for all.")
+    parser.add_argument("--sort", default = None, help = "column the results are sorted by, e.g. Year, or --sort=-Year for descending.")
+    args = parser.parse_args()
+
+    # Checked before the dataset is loaded.
+    if args.sort and args.sort.lstrip("-") not in SORTABLE:
+        parser.error(f"argument --sort: invalid column {args.sort!r} (choose from {', '.join(SORTABLE)}, - prefix for descending)")
+
+    begin = time.perf_counter()
+    engine = QueryEngine.from_config()
+    loaded = time.perf_counter()
+
+    if args.catalog:
+        queries = engine.anime_info["Title"].dropna()
+    elif args.queries:
+        queries = args.queries
+    else:
+        queries = (line.rstrip("\n") for line in sys.stdin)
+
+    count = 0
+    for value in queries:
+        if not value:
+            continue
+
+        start = time.perf_counter()
+        answer = engine.query(value, kind = args.kind)
+        if args.sort:
+            answer = engine.sort(answer, args.sort.lstrip("-"), descending = args.sort.startswith("-"))
+        rows = engine.rows(answer, top = args.top or None)
+
+        sys.stdout.write(json.dumps({"query": value, "kind": answer["kind"], "title": answer["title"], "results": rows,
+                                     "elapsed_ms": round((time.perf_counter() - start) * 1000, 3)}) + "\n")
+        count += 1
+
+    elapsed = time.perf_counter() - loaded
+    print(json.dumps({"queries": count, "load_s": round(loaded - begin, 3), "query_s": round(elapsed, 3),
+                      "queries_per_s": round(count / elapsed, 1) if elapsed else None}), file = sys.stderr)
@@ -0,0 +1,244 @@
+import argparse
+import json
+import os
+import sqlite3
+import time
+
+import pandas as pd
+import yaml
+
+from jikan_scheduler import TokenBucket, with_retries
+
+
+'''
+NOTE: Incremental refresh of the processed dataset through the Jikan API. Only titles added since the last sync
+(mal_id over the watermark) and titles currently airing are fetched, with their recommendations. Results are appended
+to delta files, merged over the processed dataset when the application loads it (see data_processing.merge_anime_delta),
+so a refresh costs time proportional to the changes, not to the catalog.
+
+Every fetched title is committed to a SQLite state file before the next one is requested: an interrupted refresh
+resumes where it stopped.
+
+    python refresh.py [--base-url http://127.0.0.1:8765/v4] [--limit 100]
+'''
+
+
+class JikanRefresh:
+    """
+    Resumable, rate limited refresh of the processed dataset.
+
+    Args:
+        state_path (str): SQLite file holding the watermark and the progress of the current sync.
+        dataset (str): Processed anime dataset (data/anime_info_processed.csv), its largest Anime_id is the first watermark.
+        anime_delta (str): Delta file of refreshed titles, appended to.
+        recomendations_delta (str): Delta file of their recommendation pairs, appended to.
+        base_url (str, optional): Jikan v4 base URL, None for api.jikan.moe.
+        rate (float, optional): Requests per second.
+        burst (int, optional): Requests allowed back to back.
+    """
+
+    def __init__(self, state_path:str, dataset:str, anime_delta:str, recomendations_delta:str, base_url:str = None, rate:float = 1.0, burst:int = 2):
+
+        # variables.
+        self.dataset = dataset
+        self.anime_delta = anime_delta
+        self.recomendations_delta = recomendations_delta
+        self.base_url = (base_url or "https://api.jikan.moe/v4").rstrip("/")
+        self.bucket = TokenBucket(rate, burst)
+        self.session = None
+        self.requests = 0
+
+        self.connection = sqlite3.connect(state_path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS watermark (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS pending (
+                anime_id INTEGER PRIMARY KEY,
+                entry TEXT NOT NULL,
+                result TEXT);""")
+        self.connection.commit()
+
+    def get(self, key:str, default = None):
+        row = self.connection.execute("SELECT value FROM watermark WHERE key = ?", (key,)).fetchone()
+        return default if row is None else json.loads(row[0])
+
+    def set(self, key:str, value):
+        self.connection.execute("INSERT OR REPLACE INTO watermark (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def call(self, path:str, **parameters):
+        """
+        Performs a request through the pooled session, within the rate limit and with retries. jikanpy has no call
+        for the v4 listing (/anime?order_by=...), every refresh request goes through the session directly.
+
+        Args:
+            path (str): Path under the base URL, e.g. "/anime/1/statistics".
+            **parameters: Query string.
+
+        Raises:
+            APIException: on an error status, once retries are exhausted.
+
+        Returns:
+            dict: The JSON response.
+        """
+        import requests
+        from jikanpy.exceptions import APIException
+
+        if self.session is None:
+            self.session = requests.Session()
+
+        def request():
+            response = self.session.get(f"{self.base_url}{path}", params = parameters, timeout = 30)
+            if response.status_code >= 400:
+                raise APIException(response.status_code, {"error": response.text})
+            return response.json()
+
+        self.requests += 1
+        return with_retries(request, self.bucket)
+
+    def discover(self, max_id:int):
+        """
+        Lists the titles to refresh: every title over the watermark (newest first, paging stops at the watermark) and
+        every title currently airing.
+
+        Args:
+            max_id (int): The watermark, largest Anime_id already in the dataset.
+
+        Returns:
+            dict: Anime_id -> anime object of the listing.
+        """
+        found = {}
+
+        for parameters, stop_at_watermark in (({"order_by": "mal_id", "sort": "desc"}, True),
+                                              ({"status": "airing", "order_by": "mal_id", "sort": "desc"}, False)):
+            page = 1
+            while True:
+                response = self.call("/anime", page = page, **parameters)
+                entries = response["data"]
+
+                for entry in entries:
+                    if stop_at_watermark and entry["mal_id"] <= max_id:
+                        break
+                    found[entry["mal_id"]] = entry
+                else:
+                    if response["pagination"]["has_next_page"]:
+                        page += 1
+                        continue
+                break
+
+        return found
+
+    def fetch(self, entry:dict):
+        """
+        Fetches what the listing lacks (completed count, recommendations) and builds the processed rows of a title.
+
+        Args:
+            entry (dict): Anime object of the listing.
+
+        Returns:
+            dict: {"anime": processed row, "recomendations": [(Animea, Animeb, Num_recommenders), ...]}.
+        """
+        anime_id = entry["mal_id"]
+        statistics = self.call(f"/anime/{anime_id}/statistics")["data"]
+        recomendations = self.call(f"/anime/{anime_id}/recommendations")["data"]
+
+        aired = (entry.get("aired") or {}).get("from")
+        names = lambda key: "|".join(item["name"] for item in entry.get(key) or [])
+
+        # Same columns as data_processing.anime_processor. Rank is kept from the dataset on merge (0 for new titles):
+        # it is a rank over the whole catalog, not computable from one title.
+        anime = {"Title": entry["title"].replace("(TV)", ""),
+                 "Studios": names("studios"),
+                 "Genres": "|".join(filter(None, (names("genres"), names("themes")))),
+                 "Rank": 0,
+                 "Completed_count": int(statistics.get("completed") or 0),
+                 "Year": int(aired[:4]) if aired else 0,
+                 "Anime_id": anime_id}
+
+        return {"anime": anime, "recomendations": [(anime_id, item["entry"]["mal_id"], int(item["votes"])) for item in recomendations]}
+
+    def run(self, limit:int = None):
+        """
+        Runs a sync, or resumes the interrupted one. Titles are fetched one by one and committed as they come, the
+        delta files and the watermark are only updated once every title of the sync is fetched.
+
+        Args:
+            limit (int, optional): Titles fetched by this call at most, the rest is left for the next one.
+
+        Returns:
+            dict: Summary (sync, discovered, fetched, remaining, requests).
+        """
+        sync = self.get("running")
+
+        if sync is None:
+            max_id = self.get("max_id")
+            if max_id is None:
+                max_id = int(pd.read_csv(self.dataset, usecols = ["Anime_id"])["Anime_id"].max())
+
+            found = self.discover(max_id)
+            sync = self.get("sync", 0) + 1
+
+            with self.connection:
+                self.connection.execute("DELETE FROM pending")
+                self.connection.executemany("INSERT INTO pending (anime_id, entry) VALUES (?, ?)",
+                                            [(anime_id, json.dumps(entry)) for anime_id, entry in found.items()])
+                self.set("running", sync)
+                self.set("next_max_id", max([max_id, *found]))
+
+        todo = self.connection.execute("SELECT anime_id, entry FROM pending WHERE result IS NULL ORDER BY anime_id").fetchall()
+        fetched = 0
+
+        for anime_id, entry in todo[:limit]:
+            result = self.fetch(json.loads(entry))
+            with self.connection:
+                self.connection.execute("UPDATE pending SET result = ? WHERE anime_id = ?", (json.dumps(result), anime_id))
+            fetched += 1
+
+        remaining = len(todo) - fetched
+        discovered = self.connection.execute("SELECT COUNT(*) FROM pending").fetchone()[0]
+
+        if remaining == 0:
+            self.publish(sync)
+
+        return {"sync": sync, "discovered": discovered, "fetched": fetched, "remaining": remaining, "requests": self.requests}
+
+    def publish(self, sync:int):
+        """
+        Appends the fetched titles of a sync to the delta files, then moves the watermark. If interrupted in between,
+        the next run appends them again: merging keeps the last copy, so this is harmless.
+
+        Args:
+            sync (int): The sync number, recorded with every delta row.
+        """
+        results = [json.loads(row[0]) for row in self.connection.execute("SELECT result FROM pending ORDER BY anime_id")]
+
+        anime = pd.DataFrame([result["anime"] for result in results], columns = ["Title", "Studios", "Genres", "Rank", "Completed_count", "Year", "Anime_id"])
+        recomendations = pd.DataFrame([pair for result in results for pair in result["recomendations"]], columns = ["Animea", "Animeb", "Num_recommenders"])
+
+        for data, filepath in ((anime, self.anime_delta), (recomendations, self.recomendations_delta)):
+            data["Sync"] = sync
+            data.to_csv(filepath, mode = "a", header = not os.path.exists(filepath), index = False)
+
+        with self.connection:
+            self.connection.execute("DELETE FROM pending")
+            self.set("max_id", self.get("next_max_id"))
+            self.set("sync", sync)
+            self.set("synced_at", time.time())
+            self.connection.execute("DELETE FROM watermark WHERE key IN ('running', 'next_max_id')")
+
+    def close(self):
+        self.connection.close()
+
+
+if __name__ == "__main__":
+    with open("config.yaml") as file:
+        config = yaml.safe_load(file)
+
+    parser = argparse.ArgumentParser(description = "Incremental refresh of the dataset through the Jikan API.")
+    parser.add_argument("--base-url", default = config["jikan"]["base_url"])
+    parser.add_argument("--limit", type = int, default = None, help = "titles fetched by this run at most.")
+    args = parser.parse_args()
+
+    refresh = JikanRefresh(config["refresh"]["state_path"], os.path.join("data", "anime_info_processed.csv"),
+                           config["refresh"]["anime_delta"], config["refresh"]["recomendations_delta"],
+                           base_url = args.base_url or None, rate = config["jikan"]["rate_per_second"], burst = config["jikan"]["burst"])
+    print(json.dumps(refresh.run(limit = args.limit)))
+    refresh.close()
@@ -0,0 +1,194 @@
+import tkinter as tk
+import pandas as pd
+from tkinter import ttk
+
+
+class VirtualTree(ttk.Treeview):
+    """
+    ttk.Treeview that materializes rows on demand. Only the first page (visible rows plus a small buffer) is inserted
+    up front, further pages are pulled from the underlying DataFrame as the user scrolls towards the end. Time to first
+    paint does not depend on how many rows matched.
+
+    Args:
+        master (tk.Widget): The parent container.
+        data (pd.DataFrame): Rows to be displayed. Every column becomes a heading.
+        page_size (int, optional): Rows inserted per page.
+        threshold (float, optional): Scroll fraction (0-1) that triggers the next page.
+    """
+
+    def __init__(self, master:tk.Widget, data:pd.DataFrame, page_size:int = 50, threshold:float = 0.8, **kwargs):
+        super().__init__(master, columns = list(data.columns), show = "headings", **kwargs)
+
+        # variables.
+        self.page_size = page_size
+        self.threshold = threshold
+        self.data = data
+        self.loaded = 0
+        self.shown = [] # values of the materialized rows, item ids are their positions.
+
+        for column in data.columns:
+            self.heading(column, text = column)
+
+        self.configure(yscrollcommand = self.on_scroll)
+        self.load_page()
+
+    def load(self, data:pd.DataFrame, widths:dict = None):
+        """
+        Displays new rows in place. Items are kept and only rewritten where their values changed, surplus ones are
+        deleted, so a view change costs at most one page of Tk calls.
+
+        Args:
+            data (pd.DataFrame): Rows to be displayed. Every column becomes a heading.
+            widths (dict, optional): Fixed widths of some columns, the other ones get the default width.
+        """
+        # variables.
+        columns = list(data.columns)
+        widths = widths or {}
+        stop = min(self.page_size, len(data))
+
+        if columns != list(self["columns"]):
+            self.configure(columns = columns, displaycolumns = columns)
+        for column in columns:
+            self.heading(column, text = column)
+            self.column(column, width = widths.get(column, 200), stretch = column not in widths)
+
+        for position, row in enumerate(data.iloc[:stop].itertuples(index = False)):
+            values = list(row)
+            if position >= len(self.shown):
+                self.insert("", "end", iid = str(position), values = values)
+                self.shown.append(values)
+            elif self.shown[position] != values:
+                self.item(str(position), values = values)
+                self.shown[position] = values
+
+        if len(self.shown) > stop:
+            self.delete(*[str(position) for position in range(stop, len(self.shown))])
+            del self.shown[stop:]
+
+        self.data = data
+        self.loaded = stop
+        self.yview_moveto(0)
+
+    def load_page(self):
+        """
+        Inserts the next page of rows from the underlying DataFrame. Does nothing once every row is materialized.
+        """
+        start = self.loaded
+        stop = min(start + self.page_size, len(self.data))
+
+        for position, row in enumerate(self.data.iloc[start:stop].itertuples(index = False), start = start):
+            values = list(row)
+            self.insert("", "end", iid = str(position), values = values)
+            self.shown.append(values)
+
+        self.loaded = stop
+
+    def value(self, item:str):
+        """
+        Returns the first column of a row, as stored in the DataFrame (Tk would turn numeric looking titles into int).
+
+        Args:
+            item (str): The item id, e.g. from identify_row.
+        """
+        return self.data.iat[int(item), 0]
+
+    def on_scroll(self, first:str, last:str):
+        """
+        yscrollcommand hook. Pulls the next page when the view gets close to the last materialized row.
+
+        Args:
+            first (str): Top visible fraction, given by Tk.
+            last (str): Bottom visible fraction, given by Tk.
+        """
+        if self.loaded < len(self.data) and float(last) >= self.threshold:
+            self.load_page()
+
+
+class ResultsPane(tk.Frame):
+    """
+    The one results pane of the application. Created once and updated in place by every view (genre/studio,
+    similar to, did you mean, favorites), so the widget count stays flat however long the session is. Clicking the
+    heading of a sortable column sorts the view by it, clicking it again reverses the order.
+
+    Args:
+        master (tk.Widget): The application window.
+        x_loc (int): The x location in perspective of the main aplication window.
+        y_loc (int): The y location in perspective of the main aplication window.
+        orders (indexes.SortOrders, optional): Sort permutations of the dataset the views are taken from.
+    """
+
+    def __init__(self, master:tk.Widget, x_loc:int, y_loc:int, orders = None):
+        super().__init__(master, borderwidth = 0.0)
+
+        # variables.
+        self.x_loc = x_loc
+        self.y_loc = y_loc
+        self.orders = orders
+        self.handlers = {}
+        self.widths = None
+        self.sortable = False
+        self.sorted_by = None # (column, descending) of the current view.
+
+        self.tree = VirtualTree(self, pd.DataFrame())
+        self.tree.pack(expand = True, fill = "both")
+
+        # Bound once, dispatched to the handlers of the current view.
+        self.tree.bind("<Double-1>", lambda event: self.dispatch("double_click", event))
+        self.tree.bind("<Button-3>", lambda event: self.dispatch("right_click", event))
+        self.tree.bind("<Motion>", lambda event: self.dispatch("hover", event))
+
+    def show(self, data:pd.DataFrame, widths:dict = None, sortable:bool = False, **handlers):
+        """
+        Displays a view.
+
+        Args:
+            data (pd.DataFrame): Rows to be displayed. The first column is what handlers receive.
+            widths (dict, optional): Fixed widths of some columns.
+            sortable (bool, optional): The index of data holds row positions of the dataset of orders, its headings sort the view.
+            **handlers (callable): double_click, right_click and hover callbacks, called with the row value.
+        """
+        self.handlers = handlers
+        self.widths = widths
+        self.sortable = sortable and self.orders is not None
+        self.sorted_by = None
+        self.render(data)
+        self.place(x = self.x_loc, y = self.y_loc)
+        self.lift()
+
+    def hide(self):
+        self.handlers = {}
+        self.sortable = False
+        self.tree.load(pd.DataFrame())
+        self.place_forget()
+
+    def render(self, data:pd.DataFrame):
+        self.tree.load(data, self.widths)
+
+        for column in data.columns:
+            if self.sortable and column in self.orders:
+                arrow = "" if self.sorted_by is None or self.sorted_by[0] != column else (" \u25bc" if self.sorted_by[1] else " \u25b2")
+                self.tree.heading(column, text = f"{column}{arrow}", command = lambda column = column: self.sort_by(column))
+            else:
+                self.tree.heading(column, command = "")
+
+    def sort_by(self, column:str):
+        """
+        Heading callback. Orders the rows of the view by a column, through the precomputed permutation: only the
+        positions of the view are sorted, and only the first page of rows is rewritten.
+
+        Args:
+            column (str): The clicked column.
+        """
+        descending = self.sorted_by == (column, False) # a second click reverses the order.
+        data = self.tree.data
+
+        self.sorted_by = (column, descending)
+        self.render(data.iloc[self.orders.argsort(data.index.to_numpy(), column, descending = descending)])
+
+    def dispatch(self, name:str, event:tk.Event):
+        row = self.tree.identify_row(event.y)
+        handler = self.handlers.get(name)
+
+        # the value is read before the handler runs, a handler may load another view.
+        if row and handler:
+            handler(self.tree.value(row))
@@ -0,0 +1,195 @@
+import argparse
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import TimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import yaml
+
+from query_engine import QueryEngine
+
+
+'''
+NOTE: Serves the recommendation logic of the application to several clients at once, as JSON over HTTP. The dataset,
+the indexes, the recommendation graph and the fuzzy search are built once at start-up and only read by the request
+threads. Jikan details go through one shared scheduler (rate limit, coalescing) and the persistent cache, so clients
+asking for the same title cost one upstream request.
+
+    python server.py [--port 8080]
+
+    GET /query?q=<text>[&kind=auto|browse|similar|search]   as the search bar does
+    GET /browse?q=<genre or studio>
+    GET /similar?q=<title>
+    GET /search?q=<misspelled title>
+    GET /anime/<id>, /anime/<id>/reviews                    Jikan details
+    GET /stats                                              request count, latency percentiles, cache hits
+
+Every query endpoint takes &top=<n> (50 by default, 0 for all) and &sort=<column> (-<column> for descending: Title,
+Studios, Rank, Year, Completed_count).
+'''
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """
+    Routes a request to the shared QueryEngine or JikanScheduler of the server.
+    """
+
+    protocol_version = "HTTP/1.1" # keep-alive, clients reuse their connection.
+
+    def do_GET(self):
+        begin = time.perf_counter()
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = url.path.strip("/").split("/")
+
+        try:
+            status, body = self.route(parts, query)
+        except ValueError as e:
+            status, body = 400, {"error": str(e)}
+        except Exception as e:
+            status, body = 500, {"error": str(e)}
+
+        self.send_json(body, status)
+        self.server.record(time.perf_counter() - begin)
+
+    def route(self, parts:list, query:dict):
+        """
+        Args:
+            parts (list): The path, split.
+            query (dict): The query string.
+
+        Returns:
+            tuple(int, dict): HTTP status and JSON body.
+        """
+        server = self.server
+        engine = server.engine
+
+        if parts[0] in ("query", "browse", "similar", "search") and len(parts) == 1:
+            if not query.get("q"):
+                return 400, {"error": "Missing q."}
+
+            if parts[0] == "query":
+                answer = engine.query(query["q"], kind = query.get("kind", "auto"))
+            elif parts[0] == "search":
+                answer = engine.did_you_mean(query["q"])
+            else:
+                answer = getattr(engine, parts[0])(query["q"])
+
+            if answer is None:
+                return 404, {"error": f"Not found: {query['q']}"}
+            if query.get("sort"):
+                answer = engine.sort(answer, query["sort"].lstrip("-"), descending = query["sort"].startswith("-"))
+
+            top = int(query.get("top", 50)) or None
+            return 200, {"query": answer["query"], "kind": answer["kind"], "title": answer["title"], "results": engine.rows(answer, top = top)}
+
+        if parts[0] == "anime" and len(parts) in (2, 3) and parts[1].isdigit():
+            endpoint = "anime" if len(parts) == 2 else parts[2]
+            if endpoint not in ("anime", "reviews"):
+                return 404, {"error": "Unknown endpoint."}
+
+            try:
+                return 200, server.scheduler.submit(endpoint, int(parts[1])).result(timeout = server.timeout)
+            except TimeoutError:
+                return 504, {"error": "Jikan did not answer in time."}
+
+        if parts == ["stats"]:
+            return 200, server.stats()
+
+        return 404, {"error": "Unknown endpoint."}
+
+    def send_json(self, data:dict, status:int = 200):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RecommendationServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server holding the shared, read-only query engine and the shared Jikan scheduler.
+
+    Args:
+        address (tuple): (host, port) to bind, port 0 picks a free one.
+        engine (QueryEngine): The query layer. Its lazy parts are built here, before any request thread runs.
+        scheduler (JikanScheduler): The shared Jikan scheduler.
+        timeout (float, optional): Seconds a request waits for Jikan.
+        window (int, optional): Latest request latencies kept for the stats.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address:tuple, engine:QueryEngine, scheduler, timeout:float = 30.0, window:int = 10000):
+        super().__init__(address, ServiceHandler)
+
+        # variables.
+        self.engine = engine
+        self.scheduler = scheduler
+        self.timeout = timeout
+        self.latencies = deque(maxlen = window)
+        self.requests = 0
+        self.lock = threading.Lock()
+
+        engine.recomendations_graph()
+        engine.fuzzy_search()
+
+    def record(self, seconds:float):
+        with self.lock:
+            self.latencies.append(seconds)
+            self.requests += 1
+
+    def stats(self):
+        """
+        Returns:
+            dict: Requests served, latency percentiles (ms) over the latest window, Jikan cache counters.
+        """
+        with self.lock:
+            latencies = np.array(self.latencies) * 1000
+            requests = self.requests
+
+        percentiles = dict(zip(("p50_ms", "p90_ms", "p99_ms"), np.percentile(latencies, (50, 90, 99)).round(3).tolist())) if len(latencies) else {}
+        return {"requests": requests, **percentiles, "jikan_cache": self.scheduler.cache.stats()}
+
+
+def make_server(host:str = "127.0.0.1", port:int = 8080, config:str = "config.yaml"):
+    """
+    Creates the server, as configured. Call serve_forever (or run it on a thread) to start it.
+
+    Args:
+        host (str, optional): Interface to bind.
+        port (int, optional): Port to bind, 0 picks a free one.
+        config (str, optional): Path to the YAML config.
+
+    Returns:
+        RecommendationServer: The server.
+    """
+    from jikan_cache import JikanCache
+    from jikan_scheduler import JikanScheduler
+
+    with open(config) as file:
+        jikan = yaml.safe_load(file)["jikan"]
+
+    cache = JikanCache(jikan["cache_path"], ttl = jikan["cache_ttl"], max_bytes = jikan["cache_max_bytes"])
+    scheduler = JikanScheduler(cache, base_url = jikan["base_url"] or None, rate = jikan["rate_per_second"], burst = jikan["burst"])
+
+    return RecommendationServer((host, port), QueryEngine.from_config(config), scheduler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "JSON recommendation service.")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 8080)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port)
+    print(f"myAnimeTerminal service on http://{args.host}:{server.server_port}")
+    server.serve_forever()
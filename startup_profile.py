@@ -0,0 +1,41 @@
+import time
+from contextlib import contextmanager
+
+
+class StartupProfile:
+    """
+    Records how long each import and initialization step takes until the application becomes interactive.
+    Enabled with `python app.py --startup-profile`.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.spans = []
+
+    @contextmanager
+    def span(self, name:str):
+        """
+        Times the enclosed block.
+
+        Args:
+            name (str): The step name, as printed in the report.
+        """
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append((name, time.perf_counter() - begin))
+
+    def report(self):
+        """
+        Prints the timing breakdown and the total time since the profile was created (time to interactive).
+        """
+        width = max([len(name) for name, _ in self.spans] + [len("time to interactive")])
+
+        print("startup profile:")
+        for name, seconds in self.spans:
+            print(f"  {name:<{width}} {seconds * 1000:9.1f} ms")
+        print(f"  {'time to interactive':<{width}} {(time.perf_counter() - self.start) * 1000:9.1f} ms")
+
+
+profile = StartupProfile()
@@ -0,0 +1,179 @@
+import argparse
+import csv
+import json
+import os
+import re
+import time
+from urllib.parse import parse_qs, urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+'''
+NOTE: Local stand-in for the Jikan v4 API, so that the application can be used and tested offline. Responses are
+built from the processed dataset. Point the application to it with `jikan: base_url: http://127.0.0.1:8765/v4` in
+config.yaml.
+
+More on the real API: https://docs.api.jikan.moe/
+'''
+
+
+def load_catalog(filepath:str):
+    """
+    Loads the titles served by the stub.
+
+    Args:
+        filepath (str): Path to the processed anime dataset.
+
+    Returns:
+        dict: Anime_id -> row.
+    """
+    with open(filepath, newline = "", encoding = "utf-8") as file:
+        return {int(row["Anime_id"]): row for row in csv.DictReader(file)}
+
+
+def load_recomendations(filepath:str):
+    """
+    Loads the recommendation pairs served by the stub.
+
+    Args:
+        filepath (str): Path to the processed recommendations dataset. Missing is allowed (no recommendations).
+
+    Returns:
+        dict: Anime_id -> list of (Anime_id, Num_recommenders).
+    """
+    recomendations = {}
+
+    if not os.path.exists(filepath):
+        return recomendations
+
+    with open(filepath, newline = "", encoding = "utf-8") as file:
+        for row in csv.DictReader(file):
+            recomendations.setdefault(int(row["Animea"]), []).append((int(row["Animeb"]), int(float(row["Num_recommenders"]))))
+
+    return recomendations
+
+
+class StubJikanHandler(BaseHTTPRequestHandler):
+    """
+    Serves /v4/anime (listing: order_by=mal_id, sort, status=airing, page), /v4/anime/<id> and its /reviews,
+    /statistics and /recommendations, and /images/<id>.png. Every request is counted in server.requests.
+    """
+
+    page_size = 25
+
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        time.sleep(server.latency)
+
+        url = urlparse(self.path)
+        match = re.fullmatch(r"/v4/anime/(\d+)(?:/(reviews|statistics|recommendations))?", url.path)
+        image = re.fullmatch(r"/images/(\d+)\.png", url.path)
+
+        if url.path == "/v4/anime":
+            self.send_json(self.listing({key: values[-1] for key, values in parse_qs(url.query).items()}))
+        elif match and int(match.group(1)) in server.catalog:
+            row = server.catalog[int(match.group(1))]
+            if match.group(2) == "reviews":
+                self.send_json({"data": [{"user": {"username": "stub_user"}, "score": 10, "review": f"Review of {row['Title']}."}]})
+            elif match.group(2) == "statistics":
+                self.send_json({"data": {"completed": int(row["Completed_count"]), "scores": []}})
+            elif match.group(2) == "recommendations":
+                self.send_json({"data": [{"entry": {"mal_id": anime_id, "title": server.catalog[anime_id]["Title"] if anime_id in server.catalog else ""}, "votes": votes}
+                                         for anime_id, votes in server.recomendations.get(int(row["Anime_id"]), [])]})
+            else:
+                self.send_json({"data": self.anime(row)})
+        elif image:
+            with open(server.image, "rb") as file:
+                self.send_body(file.read(), "image/png")
+        else:
+            self.send_json({"status": 404, "message": "Resource does not exist"}, status = 404)
+
+    def anime(self, row:dict):
+        """
+        Args:
+            row (dict): A catalog row.
+
+        Returns:
+            dict: The anime object, with the fields the application and refresh.py read.
+        """
+        return {
+            "mal_id": int(row["Anime_id"]),
+            "title": row["Title"],
+            "synopsis": f"{row['Title']} ({row['Year']}), from {row['Studios'] or 'unknown studio'}. Genres: {row['Genres']}.",
+            "images": {"jpg": {"large_image_url": f"http://{self.headers['Host']}/images/{row['Anime_id']}.png"}},
+            "status": "Currently Airing" if int(row["Anime_id"]) in self.server.airing else "Finished Airing",
+            "aired": {"from": f"{row['Year']}-01-01T00:00:00+00:00" if row["Year"] not in ("", "0") else None},
+            "studios": [{"name": name} for name in row["Studios"].split("|") if name],
+            "genres": [{"name": name} for name in row["Genres"].split("|") if name]}
+
+    def listing(self, query:dict):
+        """
+        Args:
+            query (dict): The query string of /v4/anime.
+
+        Returns:
+            dict: One page of the catalog, by mal_id.
+        """
+        ids = sorted(self.server.catalog, reverse = query.get("sort") == "desc")
+        if query.get("status") == "airing":
+            ids = [anime_id for anime_id in ids if anime_id in self.server.airing]
+
+        page = int(query.get("page", 1))
+        start = (page - 1) * self.page_size
+
+        return {"pagination": {"current_page": page, "has_next_page": start + self.page_size < len(ids)},
+                "data": [self.anime(self.server.catalog[anime_id]) for anime_id in ids[start:start + self.page_size]]}
+
+    def send_json(self, data:dict, status:int = 200):
+        self.send_body(json.dumps(data).encode(), "application/json", status)
+
+    def send_body(self, body:bytes, content_type:str, status:int = 200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host:str = "127.0.0.1", port:int = 8765, latency:float = 0.0,
+                catalog:str = os.path.join("data", "anime_info_processed.csv"),
+                image:str = os.path.join("misc", "kav_effect_resized.png"),
+                recomendations:str = os.path.join("data", "anime_rec_processed.csv")):
+    """
+    Creates the stub server. Call serve_forever (or run it on a thread) to start it.
+
+    Args:
+        host (str, optional): Interface to bind.
+        port (int, optional): Port to bind, 0 picks a free one.
+        latency (float, optional): Seconds added to every response, to mimic the network.
+        catalog (str, optional): Processed dataset the responses are built from.
+        image (str, optional): Image served as every cover.
+        recomendations (str, optional): Processed recommendations dataset, served per title.
+
+    Returns:
+        ThreadingHTTPServer: The server.
+    """
+    server = ThreadingHTTPServer((host, port), StubJikanHandler)
+    server.catalog = load_catalog(catalog)
+    server.recomendations = load_recomendations(recomendations)
+    server.airing = set() # Anime_id listed by status=airing. Add titles to catalog/airing to simulate upstream changes.
+    server.image = image
+    server.latency = latency
+    server.requests = 0
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description = "Local stub of the Jikan v4 API.")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 8765)
+    parser.add_argument("--latency", type = float, default = 0.0)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.latency)
+    print(f"Stub Jikan on http://{args.host}:{server.server_port}/v4")
+    server.serve_forever()
@@ -0,0 +1,76 @@
+import os
+import threading
+import time
+
+import pytest
+
+
+'''
+NOTE: Views are updated in place (see results_view.ResultsPane), so however many genre, similar and favorites views a
+session goes through, the window holds the same widgets and the results pane the same rows. Needs an X display:
+run under Xvfb (e.g. `xvfb-run pytest`), skipped otherwise.
+'''
+
+pytestmark = pytest.mark.skipif(not os.environ.get("DISPLAY"), reason = "needs an X display ($DISPLAY)")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CYCLES = 5
+
+
+@pytest.fixture
+def harness(tmp_path, monkeypatch):
+    pytest.importorskip("tkinter")
+    import stub_jikan
+    from benchmarks.ui_load import UIHarness, prepare_workdir
+
+    stub = stub_jikan.make_server(port = 0, latency = 0.0,
+                                  catalog = os.path.join(ROOT, "data", "anime_info_processed.csv"),
+                                  image = os.path.join(ROOT, "misc", "kav_effect_resized.png"),
+                                  recomendations = os.path.join(ROOT, "data", "anime_rec_processed.csv"))
+    threading.Thread(target = stub.serve_forever, daemon = True).start()
+
+    prepare_workdir(str(tmp_path), f"http://127.0.0.1:{stub.server_port}/v4", rate = 50.0, instant = True)
+    monkeypatch.chdir(tmp_path) # the application reads config.yaml, data/ and misc/ from the current folder.
+
+    from app import AnimeApp
+
+    app = AnimeApp()
+    yield UIHarness(app)
+
+    if "favorites" in app.state:
+        app.state["favorites"].close()
+    app.destroy()
+    stub.shutdown()
+
+
+def drain(harness, seconds:float = 0.5):
+    # Details, reviews and covers of an opened title arrive from workers, after the step has rendered.
+    deadline = time.perf_counter() + seconds
+    harness.settle(lambda: time.perf_counter() > deadline)
+
+
+def test_views_keep_widgets_and_rows_flat(harness):
+    app = harness.app
+    tree = app.state["results_pane"].tree
+    genre = app.state["genres"][0]
+
+    # A few favorites, added once: the favorites view then has the same rows every cycle.
+    harness.pick(0, genre)
+    for row in range(3):
+        harness.click_row(row, "<Button-3>")
+
+    def cycle():
+        counts = []
+        for view in (lambda: harness.pick(0, genre), lambda: harness.click_row(0, "<Double-1>"), lambda: harness.press("SAVED")):
+            view()
+            drain(harness)
+            counts.append((len(app.winfo_children()), len(harness.widgets()), len(tree.get_children()),
+                           len(app.tk.call("image", "names"))))
+        return counts
+
+    cycle() # first use creates the detail panel, covers and status line.
+    expected = cycle()
+
+    for _ in range(CYCLES):
+        assert cycle() == expected
+    assert harness.timeouts == 0